@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from typing import Any
+
+SUBSCRIBER_QUEUE_SIZE = 8
+
+
+def format_sse(event: str, data: dict[str, Any], *, event_id: str | None = None) -> bytes:
+    lines = [f"event: {event}"]
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False, separators=(',', ':'))}")
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+class ChangeFeed:
+    """Fan-out of small change notifications to asyncio subscribers.
+
+    ``publish`` may be called from any thread; delivery happens on each subscriber's loop.
+    Slow subscribers lose their oldest pending messages instead of growing without bound.
+    """
+
+    def __init__(self, *, max_subscribers: int) -> None:
+        self._max_subscribers = max_subscribers
+        self._lock = threading.Lock()
+        self._subscribers: dict[asyncio.Queue[dict[str, Any]], asyncio.AbstractEventLoop] = {}
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    @property
+    def is_full(self) -> bool:
+        with self._lock:
+            return len(self._subscribers) >= self._max_subscribers
+
+    def subscribe(self) -> asyncio.Queue[dict[str, Any]] | None:
+        """Register a queue on the running loop, or return ``None`` when the feed is full."""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            if len(self._subscribers) >= self._max_subscribers:
+                return None
+            self._subscribers[queue] = loop
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue[dict[str, Any]]) -> None:
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    def publish(self, message: dict[str, Any]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, message)
+            except RuntimeError:
+                self.unsubscribe(queue)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue[dict[str, Any]], message: dict[str, Any]) -> None:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(message)
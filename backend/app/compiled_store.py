@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import time as dtime
+from functools import lru_cache
+import hashlib
+import json
+import os
+from pathlib import Path
+import shutil
+from typing import Any, Iterable, Iterator
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from . import data_loader, utils
+from .data_loader import OUTPUT_COLUMNS
+from .snapshot import SnapshotColumns, sort_by_date
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms run a single worker
+    fcntl = None
+
+COMPILED_FORMAT_VERSION = 2
+MANIFEST_NAME = "manifest.json"
+KEEP_COMPILED_VERSIONS = 3
+POINTER_NAME = "CURRENT"
+LOCK_NAME = ".lock"
+INDEX_PREFIX = "index."
+POSTINGS_PREFIX = "postings."
+
+DATE_COLUMNS = ("date",)
+TIME_COLUMNS = ("start_time_obj", "end_time_obj")
+TEXT_COLUMNS = tuple(column for column in OUTPUT_COLUMNS if column not in DATE_COLUMNS + TIME_COLUMNS)
+
+
+@lru_cache
+def _parser_fingerprint() -> str:
+    """Hash of the parsing code, so a deploy with new parsing rules never reuses stale output."""
+    digest = hashlib.sha256()
+    for module in (data_loader, utils):
+        digest.update(Path(module.__file__).read_bytes())
+    return digest.hexdigest()
+
+
+def source_content_hash(paths: Iterable[Path]) -> str:
+    digest = hashlib.sha256()
+    digest.update(f"format:{COMPILED_FORMAT_VERSION}|parser:{_parser_fingerprint()}".encode("utf-8"))
+    for path in paths:
+        digest.update(b"\0" + path.name.encode("utf-8") + b"\0")
+        if not path.exists():
+            digest.update(b"missing")
+            continue
+        with path.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _encode_seconds(values: pd.Series) -> np.ndarray:
+    encoded = np.full(len(values), -1, dtype=np.int32)
+    for position, value in enumerate(values.tolist()):
+        if isinstance(value, dtime):
+            encoded[position] = value.hour * 3600 + value.minute * 60 + value.second
+    return encoded
+
+
+def _decode_seconds(values: np.ndarray) -> list[dtime | None]:
+    return [
+        dtime(int(value) // 3600, int(value) % 3600 // 60, int(value) % 60) if value >= 0 else None
+        for value in values.tolist()
+    ]
+
+
+def _encode_text(values: pd.Series) -> tuple[np.ndarray, list[str]] | None:
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    strings = uniques.tolist()
+    if any(not isinstance(item, str) for item in strings):
+        return None
+    return codes.astype(np.int32), strings
+
+
+def _decode_text(codes: np.ndarray, strings: list[str]) -> np.ndarray:
+    lookup = np.array([*strings, None], dtype=object)
+    return lookup[np.where(codes < 0, len(strings), codes)]
+
+
+@dataclass(frozen=True, eq=False)
+class CompiledDataset:
+    """A date-sorted frame with its snapshot indexes."""
+
+    frame: pd.DataFrame
+    columns: SnapshotColumns
+
+    @classmethod
+    def build(cls, frame: pd.DataFrame) -> CompiledDataset:
+        frame = sort_by_date(frame)
+        return cls(frame=frame, columns=SnapshotColumns.build(frame))
+
+
+class CompiledStore:
+    """On-disk cache of the normalized schedule frame, one columnar directory per source hash.
+
+    Several worker processes can use one store: ``loader_lock`` lets a single process parse
+    the sources while the others wait and then load its output, and ``publish`` moves the
+    ``CURRENT`` pointer file atomically so every worker notices the new version. Dates, times,
+    text codes, the date and time indexes and the filter postings are memory-mapped read-only,
+    so workers share those pages; the decoded text columns and event records are per process.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self._root = root
+
+    @property
+    def pointer_path(self) -> Path:
+        return self._root / POINTER_NAME
+
+    def _entry_dir(self, key: str) -> Path:
+        return self._root / key
+
+    @contextmanager
+    def loader_lock(self) -> Iterator[None]:
+        """Exclusive cross-process lock held while a dataset is parsed and compiled."""
+        handle = None
+        if fcntl is not None:
+            try:
+                self._root.mkdir(parents=True, exist_ok=True)
+                handle = (self._root / LOCK_NAME).open("a+b")
+            except OSError:
+                handle = None
+        if handle is None:
+            yield
+            return
+        with handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def current(self) -> str | None:
+        try:
+            return self.pointer_path.read_text(encoding="utf-8").strip() or None
+        except OSError:
+            return None
+
+    def publish(self, key: str) -> None:
+        """Point ``CURRENT`` at ``key`` with a rename, so readers never see a partial write."""
+        if self.current() == key:
+            return
+        staging = self._root / f".{POINTER_NAME}-{uuid.uuid4().hex}"
+        try:
+            self._root.mkdir(parents=True, exist_ok=True)
+            staging.write_text(key, encoding="utf-8")
+            os.replace(staging, self.pointer_path)
+        except OSError:
+            staging.unlink(missing_ok=True)
+
+    def load(self, key: str) -> CompiledDataset | None:
+        entry = self._entry_dir(key)
+
+        def mapped(name: str) -> np.ndarray:
+            return np.load(entry / f"{name}.npy", mmap_mode="r", allow_pickle=False)
+
+        try:
+            manifest = json.loads((entry / MANIFEST_NAME).read_text(encoding="utf-8"))
+            if manifest.get("format") != COMPILED_FORMAT_VERSION:
+                return None
+
+            columns: dict[str, Any] = {}
+            for column in DATE_COLUMNS:
+                columns[column] = pd.to_datetime(mapped(column))
+            for column in TIME_COLUMNS:
+                columns[column] = _decode_seconds(mapped(column))
+            for column in TEXT_COLUMNS:
+                columns[column] = _decode_text(mapped(column), manifest["strings"][column])
+
+            postings: dict[str, dict[str, np.ndarray]] = {}
+            for column, values in manifest["postings"].items():
+                matrix = mapped(f"{POSTINGS_PREFIX}{column}")
+                postings[column] = {value: matrix[position] for position, value in enumerate(values)}
+            indexes = SnapshotColumns(
+                row_days=mapped(f"{INDEX_PREFIX}row_days"),
+                start_min=mapped(f"{INDEX_PREFIX}start_min"),
+                end_min=mapped(f"{INDEX_PREFIX}end_min"),
+                postings=postings,
+            )
+        except (OSError, ValueError, KeyError):
+            return None
+
+        return CompiledDataset(frame=pd.DataFrame(columns, columns=OUTPUT_COLUMNS), columns=indexes)
+
+    def store(self, key: str, frame: pd.DataFrame) -> bool:
+        if any(column not in frame.columns for column in OUTPUT_COLUMNS):
+            return False
+
+        dataset = CompiledDataset.build(frame)
+        frame = dataset.frame
+        strings: dict[str, list[str]] = {}
+        arrays: dict[str, np.ndarray] = {}
+        for column in DATE_COLUMNS:
+            arrays[column] = frame[column].to_numpy(dtype="datetime64[ns]")
+        for column in TIME_COLUMNS:
+            arrays[column] = _encode_seconds(frame[column])
+        for column in TEXT_COLUMNS:
+            encoded = _encode_text(frame[column])
+            if encoded is None:
+                return False
+            arrays[column], strings[column] = encoded
+        arrays[f"{INDEX_PREFIX}row_days"] = dataset.columns.row_days
+        arrays[f"{INDEX_PREFIX}start_min"] = dataset.columns.start_min
+        arrays[f"{INDEX_PREFIX}end_min"] = dataset.columns.end_min
+        postings: dict[str, list[str]] = {}
+        for column, column_postings in dataset.columns.postings.items():
+            postings[column] = list(column_postings)
+            arrays[f"{POSTINGS_PREFIX}{column}"] = np.array(list(column_postings.values()), dtype=bool).reshape(
+                len(column_postings), len(frame)
+            )
+
+        staging = self._root / f".tmp-{key}-{uuid.uuid4().hex}"
+        try:
+            staging.mkdir(parents=True)
+            for column, values in arrays.items():
+                np.save(staging / f"{column}.npy", values, allow_pickle=False)
+            manifest = {
+                "format": COMPILED_FORMAT_VERSION,
+                "rows": len(frame),
+                "strings": strings,
+                "postings": postings,
+            }
+            (staging / MANIFEST_NAME).write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+
+            target = self._entry_dir(key)
+            if target.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+                return True
+            os.replace(staging, target)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+            return False
+
+        self._prune(keep=key)
+        return True
+
+    def _prune(self, *, keep: str) -> None:
+        try:
+            entries = [
+                path
+                for path in self._root.iterdir()
+                if path.is_dir() and not path.name.startswith(".") and path.name != keep
+            ]
+            entries.sort(key=lambda path: path.stat().st_mtime, reverse=True)
+        except OSError:
+            return
+        for stale in entries[KEEP_COMPILED_VERSIONS - 1 :]:
+            shutil.rmtree(stale, ignore_errors=True)
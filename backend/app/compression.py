@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import gzip
+from typing import Hashable
+
+from .response_cache import CacheStats, ResponseCache
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - exercised only without the optional dependency
+    brotli = None
+
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+"""Content codings we can produce, in server preference order."""
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """Pick the best supported coding for an ``Accept-Encoding`` header, or ``None`` for identity."""
+    if not accept_encoding:
+        return None
+
+    qualities: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip().lower() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        qualities[coding] = quality
+
+    best: str | None = None
+    best_quality = 0.0
+    for coding in SUPPORTED_ENCODINGS:
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(body)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=9, mtime=0)
+    raise ValueError(f"Unsupported content encoding: {encoding}")
+
+
+class ResponseCompressor:
+    """Compresses response bodies once and keeps the encoded variants in their own cache.
+
+    ``cache_key`` must identify the uncompressed body (the identity ETag does); repeat requests
+    for the same representation then skip compression entirely. The cache should not be the one
+    holding the JSON bodies, or variant lookups would show up in its hit/miss statistics.
+    """
+
+    def __init__(self, cache: ResponseCache, *, min_bytes: int) -> None:
+        self._cache = cache
+        self._min_bytes = min_bytes
+
+    def encode(self, body: bytes, accept_encoding: str | None, *, cache_key: Hashable) -> tuple[bytes, str | None]:
+        if len(body) < self._min_bytes:
+            return body, None
+        encoding = negotiate_encoding(accept_encoding)
+        if encoding is None:
+            return body, None
+
+        key = (cache_key, encoding)
+        encoded = self._cache.get(key)
+        if encoded is None:
+            encoded = compress(body, encoding)
+            self._cache.put(key, encoded)
+        return encoded, encoding
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> CacheStats:
+        return self._cache.stats()
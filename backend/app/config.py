@@ -14,6 +14,22 @@ class Settings:
     allowed_origins: list[str]
     settings_password: str
     runtime_settings_file: Path
+    compiled_cache_dir: Path
+    response_cache_max_bytes: int
+    response_cache_ttl_seconds: int
+    sse_max_subscribers: int
+    sse_heartbeat_seconds: int
+    compression_min_bytes: int
+    version_history_size: int
+    io_workers: int
+    watch_poll_seconds: int
+
+
+def _parse_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
 
 
 def _parse_origins(raw: str) -> list[str]:
@@ -26,10 +42,7 @@ def get_settings() -> Settings:
     default_data_dir = Path(__file__).resolve().parents[1] / "data"
     data_dir = Path(os.getenv("DATA_DIR", str(default_data_dir))).resolve()
 
-    try:
-        cache_ttl_seconds = int(os.getenv("CACHE_TTL_SECONDS", "60"))
-    except ValueError:
-        cache_ttl_seconds = 60
+    cache_ttl_seconds = _parse_int("CACHE_TTL_SECONDS", 60)
 
     timezone = os.getenv("TZ", "Europe/Warsaw")
     allowed_origins = _parse_origins(os.getenv("ALLOWED_ORIGINS", "http://localhost:5173"))
@@ -37,6 +50,7 @@ def get_settings() -> Settings:
     runtime_settings_file = Path(
         os.getenv("RUNTIME_SETTINGS_FILE", str(data_dir / "runtime_settings.json"))
     ).resolve()
+    compiled_cache_dir = Path(os.getenv("COMPILED_CACHE_DIR", str(data_dir / ".compiled"))).resolve()
 
     return Settings(
         data_dir=data_dir,
@@ -45,4 +59,13 @@ def get_settings() -> Settings:
         allowed_origins=allowed_origins,
         settings_password=settings_password,
         runtime_settings_file=runtime_settings_file,
+        compiled_cache_dir=compiled_cache_dir,
+        response_cache_max_bytes=max(_parse_int("RESPONSE_CACHE_MAX_BYTES", 32 * 1024 * 1024), 0),
+        response_cache_ttl_seconds=max(_parse_int("RESPONSE_CACHE_TTL_SECONDS", 600), 1),
+        sse_max_subscribers=max(_parse_int("SSE_MAX_SUBSCRIBERS", 1000), 0),
+        sse_heartbeat_seconds=max(_parse_int("SSE_HEARTBEAT_SECONDS", 15), 1),
+        compression_min_bytes=max(_parse_int("COMPRESSION_MIN_BYTES", 1024), 0),
+        version_history_size=max(_parse_int("VERSION_HISTORY_SIZE", 8), 0),
+        io_workers=max(_parse_int("IO_WORKERS", 2), 1),
+        watch_poll_seconds=max(_parse_int("WATCH_POLL_SECONDS", 2), 1),
     )
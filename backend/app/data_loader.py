@@ -9,7 +9,7 @@ import openpyxl
 import pandas as pd
 
 from .errors import DataSourceUnavailable
-from .utils import normalize_text, normalize_time_series, parse_time_value
+from .utils import normalize_text, parse_time_series, parse_time_value
 
 MAIN_FILE_NAME = "plan_zajec.xlsx"
 PRAKTYKI_CANDIDATES = ("praktyki_tidy (1).xlsx", "praktyki_tidy.xlsx")
@@ -108,10 +108,8 @@ def load_main_data(path: Path) -> pd.DataFrame:
     df["oddzial"] = ""
     df["source"] = "main"
 
-    df["start_time_obj"] = normalize_time_series(df["start_time"])
-    df["end_time_obj"] = normalize_time_series(df["end_time"])
-    df["start_time"] = df["start_time_obj"].apply(lambda item: item.strftime("%H:%M") if item else "")
-    df["end_time"] = df["end_time_obj"].apply(lambda item: item.strftime("%H:%M") if item else "")
+    _assign_times(df, "start_time", df["start_time"])
+    _assign_times(df, "end_time", df["end_time"])
 
     for column in ("subject", "room", "type"):
         df[column] = df[column].apply(normalize_text)
@@ -119,6 +117,13 @@ def load_main_data(path: Path) -> pd.DataFrame:
     return df[OUTPUT_COLUMNS].sort_values(by=["date", "start_time_obj"], na_position="last")
 
 
+def _assign_times(df: pd.DataFrame, column: str, values: pd.Series) -> None:
+    """Fill ``<column>_obj`` with parsed times and ``<column>`` with their ``HH:MM`` labels."""
+    parsed = parse_time_series(values)
+    df[f"{column}_obj"] = parsed.times
+    df[column] = parsed.labels
+
+
 def _resolve_praktyki_path(data_dir: Path) -> Path | None:
     for filename in PRAKTYKI_CANDIDATES:
         candidate = data_dir / filename
@@ -513,19 +518,15 @@ def _load_praktyki_tidy(path: Path) -> pd.DataFrame:
             if df.empty:
                 return _empty_output()
 
-            if "start_time_obj" in df.columns and df["start_time_obj"].notna().any():
-                df["start_time_obj"] = normalize_time_series(df["start_time_obj"])
-            else:
-                fallback_start = (
-                    df["start_time"] if "start_time" in df.columns else pd.Series([None] * len(df), index=df.index)
-                )
-                df["start_time_obj"] = normalize_time_series(fallback_start)
-
-            if "end_time_obj" in df.columns and df["end_time_obj"].notna().any():
-                df["end_time_obj"] = normalize_time_series(df["end_time_obj"])
-            else:
-                fallback_end = df["end_time"] if "end_time" in df.columns else pd.Series([None] * len(df), index=df.index)
-                df["end_time_obj"] = normalize_time_series(fallback_end)
+            for column in ("start_time", "end_time"):
+                object_column = f"{column}_obj"
+                if object_column in df.columns and df[object_column].notna().any():
+                    source = df[object_column]
+                elif column in df.columns:
+                    source = df[column]
+                else:
+                    source = pd.Series([None] * len(df), index=df.index)
+                _assign_times(df, column, source)
 
             for column in ("subject", "instructor", "room", "group", "oddzial", "type"):
                 if column not in df.columns:
@@ -533,8 +534,6 @@ def _load_praktyki_tidy(path: Path) -> pd.DataFrame:
                 df[column] = df[column].apply(normalize_text)
 
             df["source"] = "praktyki"
-            df["start_time"] = df["start_time_obj"].apply(lambda item: item.strftime("%H:%M") if item else "")
-            df["end_time"] = df["end_time_obj"].apply(lambda item: item.strftime("%H:%M") if item else "")
             return df[OUTPUT_COLUMNS].sort_values(by=["date", "start_time_obj"], na_position="last")
 
         matrix = pd.read_excel(path, header=None)
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Iterable
 
+import numpy as np
 import pandas as pd
 
 from .utils import is_magdalenka_group
 
+FILTER_DIMENSIONS = ("subject", "instructor", "room", "group", "oddzial", "type")
+MAX_CACHED_MAGDALENKA_MASKS = 8
+
 
 @dataclass(frozen=True)
 class ScheduleFilters:
@@ -100,6 +104,88 @@ def apply_filters_with_magdalenka(
     return filtered
 
 
+@dataclass(frozen=True, eq=False)
+class FilterIndex:
+    """Inverted index from each normalized dimension value to a boolean row mask."""
+
+    size: int
+    postings: dict[str, dict[str, np.ndarray]]
+    _magdalenka_masks: dict[tuple[tuple[str, ...], tuple[str, ...]], np.ndarray] = field(
+        default_factory=dict,
+        repr=False,
+    )
+
+    @classmethod
+    def build(cls, df: pd.DataFrame) -> FilterIndex:
+        postings: dict[str, dict[str, np.ndarray]] = {}
+        for column in FILTER_DIMENSIONS:
+            if column not in df.columns:
+                continue
+            normalized = df[column].fillna("").astype(str).str.strip().str.lower()
+            codes, uniques = pd.factorize(normalized)
+            postings[column] = {value: codes == code for code, value in enumerate(uniques.tolist())}
+        return cls(size=len(df), postings=postings)
+
+    def _dimension_mask(self, column: str, values: tuple[str, ...], start: int, stop: int) -> np.ndarray | None:
+        column_postings = self.postings.get(column)
+        if not values or column_postings is None:
+            return None
+
+        mask = np.zeros(stop - start, dtype=bool)
+        for value in values:
+            posting = column_postings.get(value)
+            if posting is not None:
+                mask |= posting[start:stop]
+        return mask
+
+    def magdalenka_mask(
+        self,
+        *,
+        magdalenka_exact_groups: Iterable[str] | None,
+        magdalenka_prefixes: Iterable[str] | None,
+    ) -> np.ndarray:
+        """Row mask of Magdalenka groups, computed once per (exact groups, prefixes) pair."""
+        key = (tuple(magdalenka_exact_groups or ()), tuple(magdalenka_prefixes or ()))
+        cached = self._magdalenka_masks.get(key)
+        if cached is not None:
+            return cached
+
+        mask = np.zeros(self.size, dtype=bool)
+        for value, posting in self.postings.get("group", {}).items():
+            if is_magdalenka_group(value, exact_groups=key[0], prefixes=key[1]):
+                mask |= posting
+        mask.setflags(write=False)
+
+        if len(self._magdalenka_masks) >= MAX_CACHED_MAGDALENKA_MASKS:
+            self._magdalenka_masks.clear()
+        self._magdalenka_masks[key] = mask
+        return mask
+
+    def mask(
+        self,
+        filters: ScheduleFilters,
+        *,
+        start: int = 0,
+        stop: int | None = None,
+        magdalenka_exact_groups: Iterable[str] | None = None,
+        magdalenka_prefixes: Iterable[str] | None = None,
+    ) -> np.ndarray:
+        """Rows in ``start:stop`` matching ``filters``: OR within a dimension, AND across them."""
+        stop = self.size if stop is None else stop
+        result = np.ones(stop - start, dtype=bool)
+        for column in FILTER_DIMENSIONS:
+            dimension_mask = self._dimension_mask(column, getattr(filters, column), start, stop)
+            if dimension_mask is not None:
+                result &= dimension_mask
+
+        if filters.only_magdalenka:
+            result &= self.magdalenka_mask(
+                magdalenka_exact_groups=magdalenka_exact_groups,
+                magdalenka_prefixes=magdalenka_prefixes,
+            )[start:stop]
+        return result
+
+
 def extract_filter_values(df: pd.DataFrame) -> dict[str, list[str]]:
     def unique_sorted(column: str) -> list[str]:
         if column not in df.columns:
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+import threading
+from typing import Any
+
+import numpy as np
+
+from .filters import FilterIndex, ScheduleFilters
+from .runtime_settings import RuntimeSettingsData
+from .snapshot import DatasetSnapshot, EventTable
+
+
+@dataclass(frozen=True, eq=False)
+class VersionEntry:
+    """The parts of a published snapshot needed to diff its events; the frame is not kept."""
+
+    version: str
+    loaded_at: datetime
+    events: EventTable
+    filters: FilterIndex
+    runtime: RuntimeSettingsData
+
+    @classmethod
+    def of(cls, snapshot: DatasetSnapshot) -> VersionEntry:
+        return cls(
+            version=snapshot.version,
+            loaded_at=snapshot.loaded_at,
+            events=snapshot.events,
+            filters=snapshot.filters,
+            runtime=snapshot.runtime,
+        )
+
+    def matching_records(self, filters: ScheduleFilters) -> dict[str, dict[str, Any]]:
+        """Event records selected by ``filters`` under this version's runtime rules, by event id."""
+        mask = self.filters.mask(
+            filters,
+            magdalenka_exact_groups=self.runtime.magdalenka_exact_groups,
+            magdalenka_prefixes=self.runtime.magdalenka_prefixes,
+        )
+        records = self.events.records
+        return {
+            record["id"]: record
+            for record in (records[position] for position in np.flatnonzero(mask).tolist())
+            if record is not None
+        }
+
+
+@dataclass(frozen=True)
+class EventChanges:
+    added: list[dict[str, Any]]
+    removed: list[str]
+    modified: list[dict[str, Any]]
+
+
+def diff_versions(old: VersionEntry, new: VersionEntry, filters: ScheduleFilters) -> EventChanges:
+    before = old.matching_records(filters)
+    after = new.matching_records(filters)
+    return EventChanges(
+        added=[record for event_id, record in after.items() if event_id not in before],
+        removed=[event_id for event_id in before if event_id not in after],
+        modified=[
+            record
+            for event_id, record in after.items()
+            if event_id in before and before[event_id] != record
+        ],
+    )
+
+
+class VersionHistory:
+    """The last few published dataset versions, oldest first."""
+
+    def __init__(self, *, max_versions: int) -> None:
+        self._max_versions = max_versions
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, VersionEntry] = OrderedDict()
+
+    def record(self, snapshot: DatasetSnapshot) -> None:
+        if self._max_versions <= 0:
+            return
+        with self._lock:
+            self._entries.pop(snapshot.version, None)
+            self._entries[snapshot.version] = VersionEntry.of(snapshot)
+            while len(self._entries) > self._max_versions:
+                self._entries.popitem(last=False)
+
+    def get(self, version: str) -> VersionEntry | None:
+        with self._lock:
+            return self._entries.get(version)
+
+    def versions(self) -> list[str]:
+        with self._lock:
+            return list(self._entries)
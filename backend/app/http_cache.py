@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import lru_cache
+import hashlib
+from pathlib import Path
+
+from fastapi.responses import Response
+
+CACHE_CONTROL = "no-cache"
+# Content codings that get their own strong validator (RFC 9110, section 8.8.3).
+ETAG_CODINGS = ("gzip", "br")
+
+
+@lru_cache
+def _code_fingerprint() -> str:
+    """Hash of the application code, so a deploy that changes response bodies never revalidates old tags.
+
+    Snapshot versions only cover the sources and the parser; serializers, models and layout live
+    elsewhere in the package, so all of it is hashed.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(Path(__file__).resolve().parent.glob("*.py")):
+        digest.update(path.name.encode("utf-8") + b"\0" + path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def make_etag(*parts: object) -> str:
+    """Strong validator for a response fully determined by ``parts`` and the running code."""
+    payload = "|".join([_code_fingerprint(), *(repr(part) for part in parts)])
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def encoded_etag(etag: str, encoding: str | None) -> str:
+    """Validator of the ``encoding`` variant of the representation tagged ``etag``."""
+    if not encoding or etag.startswith("W/") or not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def _identity_etag(candidate: str) -> str:
+    tag = candidate.removeprefix("W/")
+    for coding in ETAG_CODINGS:
+        suffix = f'-{coding}"'
+        if tag.endswith(suffix):
+            return tag[: -len(suffix)] + '"'
+    return tag
+
+
+def matching_etag(if_none_match: str | None, etag: str) -> str | None:
+    """The ``If-None-Match`` entry that matches ``etag`` or one of its encoded variants, if any.
+
+    Weak comparison as required for If-None-Match (RFC 9110, section 13.1.2).
+    """
+    if not if_none_match:
+        return None
+    for candidate in (item.strip() for item in if_none_match.split(",")):
+        if candidate == "*":
+            return etag
+        if _identity_etag(candidate) == etag:
+            return candidate.removeprefix("W/")
+    return None
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    return matching_etag(if_none_match, etag) is not None
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(value.astimezone(timezone.utc).replace(microsecond=0), usegmt=True)
+
+
+def unmodified_since(if_modified_since: str | None, last_modified: datetime) -> bool:
+    """Whether ``If-Modified-Since`` already covers ``last_modified`` (second precision, per HTTP dates)."""
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def not_modified(etag: str, *, last_modified: str | None = None) -> Response:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+    return Response(status_code=304, headers=headers)
+
+
+def json_bytes_response(body: bytes, *, etag: str | None = None, encoding: str | None = None) -> Response:
+    """JSON response from pre-serialized bytes, optionally already compressed with ``encoding``.
+
+    ``etag`` is the identity validator; the compression middleware derives the per-coding one.
+    """
+    headers: dict[str, str] = {"Vary": "Accept-Encoding"}
+    if etag:
+        headers["ETag"] = etag
+        headers["Cache-Control"] = CACHE_CONTROL
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time as dtime, timedelta, timezone
+from typing import Any
+from zoneinfo import ZoneInfo
+
+PRODID = "-//Plan Zajec//Plan Zajec API//PL"
+UID_DOMAIN = "plan-zajec"
+MAX_LINE_OCTETS = 75
+
+
+def escape_text(value: str) -> str:
+    """TEXT value escaping from RFC 5545, section 3.3.11."""
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+        .replace("\r", "\\n")
+    )
+
+
+def fold_line(line: str) -> bytes:
+    """Encode one content line, folded at 75 octets without splitting UTF-8 sequences."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= MAX_LINE_OCTETS:
+        return encoded + b"\r\n"
+
+    parts: list[bytes] = []
+    start = 0
+    limit = MAX_LINE_OCTETS
+    while len(encoded) - start > limit:
+        end = start + limit
+        while encoded[end] & 0xC0 == 0x80:
+            end -= 1
+        parts.append(encoded[start:end])
+        start = end
+        limit = MAX_LINE_OCTETS - 1
+    parts.append(encoded[start:])
+    return b"\r\n ".join(parts) + b"\r\n"
+
+
+def format_utc(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def calendar_header(name: str, timezone_name: str) -> bytes:
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(name)}",
+        f"X-WR-TIMEZONE:{timezone_name}",
+    ]
+    return b"".join(fold_line(line) for line in lines)
+
+
+CALENDAR_FOOTER = b"END:VCALENDAR\r\n"
+
+
+def _local_datetime(day: date, minutes: int, zone: ZoneInfo) -> datetime:
+    # Minutes past midnight may reach 24:00 for events ending at midnight.
+    return datetime.combine(day, dtime(0, 0), tzinfo=zone) + timedelta(minutes=minutes)
+
+
+def vevent(record: dict[str, Any], *, zone: ZoneInfo, stamp: str) -> bytes:
+    """One VEVENT for an ``EventTable`` record; the UID is the stable event id."""
+    day = date.fromisoformat(record["date"])
+    summary = record["subject"] or "Zajecia"
+    if record["type"]:
+        summary = f"{summary} ({record['type']})"
+    details = [
+        ("Prowadzacy", record["instructor"]),
+        ("Grupa", record["group"]),
+        ("Oddzial", record["oddzial"]),
+        ("Zrodlo", record["source"]),
+    ]
+    description = "\n".join(f"{label}: {value}" for label, value in details if value)
+
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{record['id']}@{UID_DOMAIN}",
+        f"DTSTAMP:{stamp}",
+        f"DTSTART:{format_utc(_local_datetime(day, record['start_min'], zone))}",
+        f"DTEND:{format_utc(_local_datetime(day, record['end_min'], zone))}",
+        f"SUMMARY:{escape_text(summary)}",
+    ]
+    if record["room"]:
+        lines.append(f"LOCATION:{escape_text(record['room'])}")
+    if description:
+        lines.append(f"DESCRIPTION:{escape_text(description)}")
+    lines.append("END:VEVENT")
+    return b"".join(fold_line(line) for line in lines)
@@ -81,7 +81,10 @@ def compute_time_range(day_df: pd.DataFrame, compact: bool = True) -> tuple[int,
 
     start_values = _valid_minutes(day_df["start_time_obj"])
     end_values = _valid_minutes(day_df["end_time_obj"])
+    return compute_minutes_range(start_values, end_values, compact=compact)
 
+
+def compute_minutes_range(start_values: list[int], end_values: list[int], compact: bool = True) -> tuple[int, int]:
     if not start_values or not end_values:
         return BASE_START_MIN, BASE_END_MIN
 
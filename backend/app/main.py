@@ -1,36 +1,72 @@
 from __future__ import annotations
 
+import asyncio
+from contextlib import asynccontextmanager
 from datetime import date
 from functools import lru_cache
+import inspect
+import logging
+from typing import AsyncIterator, Literal
 from urllib.parse import unquote
 import uuid
 
 from fastapi import Depends, FastAPI, File, Header, HTTPException, Query, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import Message, Receive, Scope, Send
 
+from .change_feed import format_sse
 from .config import Settings, get_settings
 from .errors import DataSourceUnavailable
 from .filters import ScheduleFilters, build_filters
+from .http_cache import (
+    CACHE_CONTROL,
+    encoded_etag,
+    etag_matches,
+    http_date,
+    json_bytes_response,
+    make_etag,
+    matching_etag,
+    not_modified,
+    unmodified_since,
+)
 from .models import (
+    CacheStatsResponse,
+    CompactWeekSchedule,
     DaySchedule,
     ErrorResponse,
     HealthResponse,
     MetaResponse,
+    RangeSchedule,
+    ReadinessResponse,
     RuntimeSettingsResponse,
     RuntimeSettingsUpdateRequest,
+    ScheduleChanges,
     WeekSchedule,
 )
-from .service import ScheduleService
+from .service import ScheduleService, dataset_change_message, week_start_for
+
+
+ICS_MEDIA_TYPE = "text/calendar; charset=utf-8"
+EVENTS_STREAM_PATH = "/api/v1/events/stream"
+
+logger = logging.getLogger(__name__)
 
 
 @lru_cache
-def get_service() -> ScheduleService:
+def _create_service() -> ScheduleService:
     settings = get_settings()
     return ScheduleService(settings=settings)
 
 
-def get_filters(
+async def get_service() -> ScheduleService:
+    # Async so FastAPI resolves it on the event loop instead of hopping to the threadpool.
+    return _create_service()
+
+
+async def get_filters(
     subject: list[str] | None = Query(default=None),
     instructor: list[str] | None = Query(default=None),
     room: list[str] | None = Query(default=None),
@@ -50,14 +86,78 @@ def get_filters(
     )
 
 
+async def _resolve_service(app: FastAPI) -> ScheduleService:
+    """The service the routes would get, honouring dependency overrides."""
+    service = app.dependency_overrides.get(get_service, get_service)()
+    return await service if inspect.isawaitable(service) else service
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    service = await _resolve_service(app)
+    try:
+        await service.run_io(service.warm_up)
+    except Exception:
+        # Stay up: /livez keeps passing, /readyz reports "loading" and requests retry the load.
+        logger.exception("Dataset warm-up failed")
+    service.start()
+    try:
+        yield
+    finally:
+        service.stop()
+
+
+def _variant_etag_message(message: Message, if_none_match: str | None) -> Message:
+    headers = MutableHeaders(raw=list(message["headers"]))
+    vary = headers.get("vary")
+    if vary is not None:
+        # Handlers already vary on Accept-Encoding and ``GZipMiddleware`` appends it once more.
+        tokens = {token.strip().lower(): token.strip() for token in vary.split(",") if token.strip()}
+        headers["vary"] = ", ".join(tokens.values())
+    etag = headers.get("etag")
+    if etag is None:
+        return {**message, "headers": headers.raw}
+    if message["status"] == 304:
+        # Echo the variant the client holds, which is the tag its 200 carried.
+        headers["etag"] = matching_etag(if_none_match, etag) or etag
+    else:
+        headers["etag"] = encoded_etag(etag, headers.get("content-encoding"))
+    return {**message, "headers": headers.raw}
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """``GZipMiddleware`` that gives every content coding its own ETag and never touches SSE.
+
+    Handlers set the identity ETag; whichever layer compressed the body, the tag is suffixed here
+    with the coding. Older Starlette releases gzip ``text/event-stream`` too and hold frames in the
+    compressor's buffer, so the stream is passed through by path regardless of the installed version.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] == EVENTS_STREAM_PATH:
+            await self.app(scope, receive, send)
+            return
+        if_none_match = Headers(scope=scope).get("if-none-match")
+
+        async def send_with_variant_etag(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message = _variant_etag_message(message, if_none_match)
+            await send(message)
+
+        await super().__call__(scope, receive, send_with_variant_etag)
+
+
 def create_app() -> FastAPI:
     settings: Settings = get_settings()
     app = FastAPI(
         title="Plan Zajec API",
         version="1.0.0",
         description="REST API for schedule data sourced from Excel files.",
+        lifespan=lifespan,
     )
 
+    # Catches responses that are not precompressed; it leaves Content-Encoding responses alone.
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_min_bytes)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.allowed_origins,
@@ -66,7 +166,7 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
-    def require_settings_password(
+    async def require_settings_password(
         service: ScheduleService = Depends(get_service),
         x_settings_password: str | None = Header(default=None),
     ) -> None:
@@ -105,42 +205,221 @@ def create_app() -> FastAPI:
     def root() -> dict[str, str]:
         return {"message": "Plan Zajec API", "docs": "/docs"}
 
+    @app.get("/livez")
+    async def livez() -> dict[str, str]:
+        return {"status": "ok"}
+
+    @app.get("/readyz", response_model=ReadinessResponse)
+    async def readyz(service: ScheduleService = Depends(get_service)) -> JSONResponse:
+        readiness = service.readiness()
+        status_code = 200 if readiness.status == "ready" else 503
+        return JSONResponse(status_code=status_code, content=readiness.model_dump(mode="json"))
+
     @app.get("/api/v1/health", response_model=HealthResponse)
-    def health(service: ScheduleService = Depends(get_service)) -> HealthResponse:
-        return service.health()
+    async def health(service: ScheduleService = Depends(get_service)) -> HealthResponse:
+        return service.health(await service.snapshot_async())
+
+    def cached_json_response(
+        service: ScheduleService,
+        body: bytes,
+        *,
+        etag: str,
+        accept_encoding: str | None,
+    ) -> Response:
+        content, encoding = service.compressor.encode(body, accept_encoding, cache_key=etag)
+        return json_bytes_response(content, etag=etag, encoding=encoding)
 
     @app.get("/api/v1/meta", response_model=MetaResponse)
-    def meta(service: ScheduleService = Depends(get_service)) -> MetaResponse:
-        return service.meta()
+    async def meta(
+        if_none_match: str | None = Header(default=None),
+        accept_encoding: str | None = Header(default=None),
+        service: ScheduleService = Depends(get_service),
+    ) -> Response:
+        snapshot = await service.snapshot_async()
+        etag = make_etag(snapshot.version, "meta")
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        return cached_json_response(service, service.meta_json(snapshot), etag=etag, accept_encoding=accept_encoding)
 
     @app.get("/api/v1/schedule/day", response_model=DaySchedule)
-    def schedule_day(
+    async def schedule_day(
         date_value: date = Query(alias="date"),
         filters: ScheduleFilters = Depends(get_filters),
+        if_none_match: str | None = Header(default=None),
+        accept_encoding: str | None = Header(default=None),
         service: ScheduleService = Depends(get_service),
-    ) -> DaySchedule:
-        return service.get_day_schedule(day_date=date_value, filters=filters)
+    ) -> Response:
+        snapshot = await service.snapshot_async()
+        etag = make_etag(snapshot.version, "day", filters, date_value)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        body = await service.day_schedule_json_async(date_value, filters, snapshot)
+        return cached_json_response(service, body, etag=etag, accept_encoding=accept_encoding)
 
-    @app.get("/api/v1/schedule/week", response_model=WeekSchedule)
-    def schedule_week(
+    @app.get(
+        "/api/v1/schedule/week",
+        response_model=WeekSchedule,
+        responses={200: {"model": CompactWeekSchedule, "description": "Z parametrem format=compact."}},
+    )
+    async def schedule_week(
         anchor_date: date = Query(),
+        format: Literal["full", "compact"] = Query(default="full"),
+        filters: ScheduleFilters = Depends(get_filters),
+        if_none_match: str | None = Header(default=None),
+        accept_encoding: str | None = Header(default=None),
+        service: ScheduleService = Depends(get_service),
+    ) -> Response:
+        snapshot = await service.snapshot_async()
+        compact = format == "compact"
+        etag = make_etag(snapshot.version, "week", filters, week_start_for(anchor_date), compact)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        body = await service.week_schedule_json_async(anchor_date, filters, snapshot, compact=compact)
+        return cached_json_response(service, body, etag=etag, accept_encoding=accept_encoding)
+
+    @app.get("/api/v1/schedule/range", response_model=RangeSchedule)
+    async def schedule_range(
+        date_from: date = Query(alias="from"),
+        date_to: date = Query(alias="to"),
+        filters: ScheduleFilters = Depends(get_filters),
+        if_none_match: str | None = Header(default=None),
+        service: ScheduleService = Depends(get_service),
+    ) -> Response:
+        snapshot = await service.snapshot_async()
+        etag = make_etag(snapshot.version, "range", filters, date_from, date_to)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        try:
+            chunks = service.iter_range_json(date_from, date_to, filters, snapshot)
+        except ValueError as exc:
+            raise HTTPException(status_code=422, detail=str(exc)) from exc
+        return StreamingResponse(
+            chunks,
+            media_type="application/json",
+            headers={"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"},
+        )
+
+    @app.get("/api/v1/schedule/changes", response_model=ScheduleChanges)
+    async def schedule_changes(
+        since: str = Query(min_length=1),
+        filters: ScheduleFilters = Depends(get_filters),
+        if_none_match: str | None = Header(default=None),
+        accept_encoding: str | None = Header(default=None),
+        service: ScheduleService = Depends(get_service),
+    ) -> Response:
+        snapshot = await service.snapshot_async()
+        etag = make_etag(snapshot.version, "changes", since, filters)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        body = await service.schedule_changes_json_async(since, filters, snapshot)
+        if body is None:
+            raise HTTPException(status_code=410, detail="Wersja danych jest zbyt stara; pobierz pelny plan.")
+        return cached_json_response(service, body, etag=etag, accept_encoding=accept_encoding)
+
+    @app.get(
+        "/api/v1/calendar.ics",
+        response_class=Response,
+        responses={200: {"content": {ICS_MEDIA_TYPE: {}}, "description": "Subskrypcja iCalendar."}},
+    )
+    async def calendar_ics(
         filters: ScheduleFilters = Depends(get_filters),
+        if_none_match: str | None = Header(default=None),
+        if_modified_since: str | None = Header(default=None),
+        accept_encoding: str | None = Header(default=None),
         service: ScheduleService = Depends(get_service),
-    ) -> WeekSchedule:
-        return service.get_week_schedule(anchor_date=anchor_date, filters=filters)
+    ) -> Response:
+        snapshot = await service.snapshot_async()
+        etag = make_etag(snapshot.version, "ics", filters)
+        last_modified = http_date(snapshot.loaded_at)
+        if etag_matches(if_none_match, etag) or (
+            if_none_match is None and unmodified_since(if_modified_since, snapshot.loaded_at)
+        ):
+            return not_modified(etag, last_modified=last_modified)
+
+        headers = {
+            "ETag": etag,
+            "Last-Modified": last_modified,
+            "Cache-Control": CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+            "Content-Disposition": 'inline; filename="plan.ics"',
+        }
+        body = service.cached_calendar_ics(filters, snapshot)
+        if body is None:
+            return StreamingResponse(
+                service.iter_calendar_ics(filters, snapshot),
+                media_type=ICS_MEDIA_TYPE,
+                headers=headers,
+            )
+        content, encoding = service.compressor.encode(body, accept_encoding, cache_key=etag)
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(content=content, media_type=ICS_MEDIA_TYPE, headers=headers)
+
+    @app.get(EVENTS_STREAM_PATH)
+    async def events_stream(service: ScheduleService = Depends(get_service)) -> StreamingResponse:
+        if service.change_feed.is_full:
+            raise HTTPException(status_code=503, detail="Zbyt wielu aktywnych subskrypcji zmian.")
+        heartbeat_seconds = service.settings.sse_heartbeat_seconds
+
+        async def stream() -> AsyncIterator[bytes]:
+            # Subscribe only once the body is being produced: a client that disconnects before the
+            # first chunk never starts this generator, so its ``finally`` could not release the slot.
+            queue = service.change_feed.subscribe()
+            if queue is None:
+                return
+            try:
+                snapshot = await service.snapshot_async()
+                message = dataset_change_message(snapshot)
+                yield format_sse("dataset", message, event_id=message["version"])
+                while True:
+                    try:
+                        message = await asyncio.wait_for(queue.get(), timeout=heartbeat_seconds)
+                    except asyncio.TimeoutError:
+                        yield b": heartbeat\n\n"
+                        continue
+                    yield format_sse("dataset", message, event_id=message["version"])
+            finally:
+                service.change_feed.unsubscribe(queue)
+
+        return StreamingResponse(
+            stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @app.get("/api/v1/cache/stats", response_model=CacheStatsResponse)
+    async def cache_stats(service: ScheduleService = Depends(get_service)) -> CacheStatsResponse:
+        stats = service.response_cache_stats()
+        return CacheStatsResponse(
+            hits=stats.hits,
+            misses=stats.misses,
+            evictions=stats.evictions,
+            entries=stats.entries,
+            size_bytes=stats.size_bytes,
+            max_bytes=stats.max_bytes,
+        )
 
     @app.get("/api/v1/settings", response_model=RuntimeSettingsResponse)
-    def get_runtime_settings(service: ScheduleService = Depends(get_service)) -> RuntimeSettingsResponse:
-        return service.get_runtime_settings()
+    async def get_runtime_settings(
+        if_none_match: str | None = Header(default=None),
+        service: ScheduleService = Depends(get_service),
+    ) -> Response:
+        # In-memory copy; after a file change the refresher thread re-reads it, not this handler.
+        runtime_data = service.runtime_settings_data()
+        etag = make_etag("settings", runtime_data)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        return json_bytes_response(service.runtime_settings_json(runtime_data), etag=etag)
 
     @app.put("/api/v1/settings", response_model=RuntimeSettingsResponse)
-    def update_runtime_settings(
+    async def update_runtime_settings(
         payload: RuntimeSettingsUpdateRequest,
         _: None = Depends(require_settings_password),
         service: ScheduleService = Depends(get_service),
     ) -> RuntimeSettingsResponse:
         try:
-            return service.update_runtime_settings(
+            return await service.run_io(
+                service.update_runtime_settings,
                 main_file=payload.main_file,
                 practical_file=payload.practical_file,
                 magdalenka_exact_groups=payload.magdalenka_exact_groups,
@@ -157,7 +436,12 @@ def create_app() -> FastAPI:
     ) -> RuntimeSettingsResponse:
         try:
             content = await file.read()
-            return service.upload_runtime_file(kind="main", filename=file.filename or "", content=content)
+            return await service.run_io(
+                service.upload_runtime_file,
+                kind="main",
+                filename=file.filename or "",
+                content=content,
+            )
         except ValueError as exc:
             raise HTTPException(status_code=422, detail=str(exc)) from exc
 
@@ -169,7 +453,12 @@ def create_app() -> FastAPI:
     ) -> RuntimeSettingsResponse:
         try:
             content = await file.read()
-            return service.upload_runtime_file(kind="practical", filename=file.filename or "", content=content)
+            return await service.run_io(
+                service.upload_runtime_file,
+                kind="practical",
+                filename=file.filename or "",
+                content=content,
+            )
         except ValueError as exc:
             raise HTTPException(status_code=422, detail=str(exc)) from exc
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import date, datetime
+from typing import Literal
 
 from pydantic import BaseModel, Field
 
@@ -53,13 +54,85 @@ class WeekSchedule(BaseModel):
     days: list[DaySchedule] = Field(default_factory=list)
 
 
+class RangeSchedule(BaseModel):
+    date_from: date
+    date_to: date
+    days: list[DaySchedule] = Field(default_factory=list)
+
+
+class ChangedEvent(BaseModel):
+    """A ``ScheduleEvent`` without the per-day layout fields."""
+
+    id: str
+    date: date
+    start_time: str
+    end_time: str
+    start_min: int
+    end_min: int
+    subject: str
+    instructor: str
+    room: str
+    group: str
+    oddzial: str
+    type: str
+    source: str
+    color_hsl: str
+
+
+class ScheduleChanges(BaseModel):
+    since: str
+    version: str
+    added: list[ChangedEvent] = Field(default_factory=list)
+    removed: list[str] = Field(default_factory=list)
+    modified: list[ChangedEvent] = Field(default_factory=list)
+
+
+class CompactDaySchedule(BaseModel):
+    date: date
+    range_start_min: int
+    range_end_min: int
+    events: list[list[str | int]] = Field(default_factory=list)
+
+
+class CompactWeekSchedule(BaseModel):
+    """``WeekSchedule`` with events as tuples ordered like ``fields``; text fields index ``strings``."""
+
+    format: Literal["compact"] = "compact"
+    version: int
+    week_start: date
+    week_end: date
+    fields: list[str]
+    strings: list[str] = Field(default_factory=list)
+    days: list[CompactDaySchedule] = Field(default_factory=list)
+
+
 class HealthResponse(BaseModel):
     status: str
     last_reload_at: datetime | None = None
+    last_checked_at: datetime | None = None
+    last_failed_at: datetime | None = None
+    last_error: str | None = None
     cache_ttl_seconds: int
     records: int
 
 
+class ReadinessResponse(BaseModel):
+    status: str
+    version: str | None = None
+    loaded_at: datetime | None = None
+    load_duration_ms: float | None = None
+    records: int = 0
+
+
+class CacheStatsResponse(BaseModel):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+    max_bytes: int
+
+
 class ErrorResponse(BaseModel):
     detail: str
     request_id: str | None = None
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import threading
+import time
+from typing import Hashable
+
+ENTRY_OVERHEAD_BYTES = 256
+
+
+@dataclass
+class _Entry:
+    body: bytes
+    size: int
+    expires_at: float
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+    max_bytes: int
+
+
+class ResponseCache:
+    """LRU cache of serialized responses bounded by a byte budget and a TTL."""
+
+    def __init__(self, *, max_bytes: int, ttl_seconds: int) -> None:
+        self._max_bytes = max_bytes
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable) -> bytes | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= now:
+                if entry is not None:
+                    self._remove_locked(key)
+                    self._evictions += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry.body
+
+    def put(self, key: Hashable, body: bytes) -> None:
+        size = len(body) + ENTRY_OVERHEAD_BYTES
+        if size > self._max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove_locked(key)
+            self._entries[key] = _Entry(body=body, size=size, expires_at=time.monotonic() + self._ttl_seconds)
+            self._size_bytes += size
+            while self._size_bytes > self._max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove_locked(oldest)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                size_bytes=self._size_bytes,
+                max_bytes=self._max_bytes,
+            )
+
+    def _remove_locked(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._size_bytes -= entry.size
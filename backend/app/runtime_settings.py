@@ -3,9 +3,11 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 import json
+import os
 import re
 import threading
-from typing import Any
+from typing import Any, Callable
+import uuid
 
 DEFAULT_MAIN_CANDIDATES = (
     "PI_s_II_3_03_2026.xlsx",
@@ -88,10 +90,30 @@ def sanitize_excel_filename(filename: str) -> str:
 
 
 class RuntimeSettingsStore:
+    """Runtime settings kept in memory; the JSON file is read again only after it changed.
+
+    ``load`` never touches the disk once a copy is cached. ``refresh`` picks up external edits and
+    is meant for background threads: it stats the file and re-reads it if its size or mtime moved.
+    """
+
     def __init__(self, *, data_dir: Path, settings_file: Path) -> None:
         self._data_dir = data_dir
         self._settings_file = settings_file
         self._lock = threading.Lock()
+        self._current: RuntimeSettingsData | None = None
+        self._signature: tuple[int, int] | None = None
+
+    def _file_signature(self) -> tuple[int, int] | None:
+        try:
+            stat = self._settings_file.stat()
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _read_locked(self) -> RuntimeSettingsData:
+        self._signature = self._file_signature()
+        self._current = self._merge_with_defaults(self._read_file())
+        return self._current
 
     def _read_file(self) -> dict[str, Any] | None:
         if not self._settings_file.exists():
@@ -122,27 +144,48 @@ class RuntimeSettingsStore:
         )
 
     def load(self) -> RuntimeSettingsData:
+        current = self._current
+        if current is not None:
+            return current
         with self._lock:
-            return self._merge_with_defaults(self._read_file())
+            return self._current or self._read_locked()
+
+    def refresh(self) -> RuntimeSettingsData:
+        """Re-read the file if its size or mtime changed since the cached copy was taken."""
+        with self._lock:
+            signature = self._file_signature()
+            # Without a file the defaults depend on which candidate files exist, so probe again.
+            if self._current is not None and signature is not None and signature == self._signature:
+                return self._current
+            return self._read_locked()
 
     def save(self, data: RuntimeSettingsData) -> RuntimeSettingsData:
         with self._lock:
-            self._settings_file.parent.mkdir(parents=True, exist_ok=True)
-            self._settings_file.write_text(
-                json.dumps(data.to_payload(), ensure_ascii=False, indent=2),
-                encoding="utf-8",
-            )
-            return data
+            return self._write_locked(data)
 
-    def compose(
-        self,
+    def _write_locked(self, data: RuntimeSettingsData) -> RuntimeSettingsData:
+        payload = json.dumps(data.to_payload(), ensure_ascii=False, indent=2)
+        self._settings_file.parent.mkdir(parents=True, exist_ok=True)
+        # Rename over the old file so readers (other workers, the watcher) never see half of it.
+        staging = self._settings_file.with_name(f".{self._settings_file.name}-{uuid.uuid4().hex}")
+        try:
+            staging.write_text(payload, encoding="utf-8")
+            os.replace(staging, self._settings_file)
+        finally:
+            staging.unlink(missing_ok=True)
+        self._current = data
+        self._signature = self._file_signature()
+        return data
+
+    @staticmethod
+    def _compose(
+        current: RuntimeSettingsData,
         *,
-        main_file: str | None = None,
-        practical_file: str | None = None,
-        magdalenka_exact_groups: list[str] | None = None,
-        magdalenka_prefixes: list[str] | None = None,
+        main_file: str | None,
+        practical_file: str | None,
+        magdalenka_exact_groups: list[str] | None,
+        magdalenka_prefixes: list[str] | None,
     ) -> RuntimeSettingsData:
-        current = self.load()
         return RuntimeSettingsData(
             main_file=sanitize_excel_filename(main_file) if main_file is not None else current.main_file,
             practical_file=sanitize_excel_filename(practical_file) if practical_file is not None else current.practical_file,
@@ -165,11 +208,21 @@ class RuntimeSettingsStore:
         practical_file: str | None = None,
         magdalenka_exact_groups: list[str] | None = None,
         magdalenka_prefixes: list[str] | None = None,
+        validate: Callable[[RuntimeSettingsData], None] | None = None,
     ) -> RuntimeSettingsData:
-        next_data = self.compose(
-            main_file=main_file,
-            practical_file=practical_file,
-            magdalenka_exact_groups=magdalenka_exact_groups,
-            magdalenka_prefixes=magdalenka_prefixes,
-        )
-        return self.save(next_data)
+        """Apply the given changes to the file as it is now and save the result.
+
+        The file is re-read under the lock rather than taken from the cached copy, which may
+        predate a save by another worker. ``validate`` may reject the result before it is written.
+        """
+        with self._lock:
+            next_data = self._compose(
+                self._read_locked(),
+                main_file=main_file,
+                practical_file=practical_file,
+                magdalenka_exact_groups=magdalenka_exact_groups,
+                magdalenka_prefixes=magdalenka_prefixes,
+            )
+            if validate is not None:
+                validate(next_data)
+            return self._write_locked(next_data)
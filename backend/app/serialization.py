@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+
+import orjson
+
+
+def dumps(value: Any) -> bytes:
+    """Compact UTF-8 JSON, byte-identical to FastAPI/Pydantic output for plain values."""
+    return orjson.dumps(value)
+
+
+def event_fragments(record: dict[str, Any]) -> tuple[bytes, bytes]:
+    """Pre-encoded JSON around the per-request layout fields of a ``ScheduleEvent``.
+
+    The event object is ``head + layout + tail``, with keys in ``ScheduleEvent`` field order.
+    """
+    head = {
+        "id": record["id"],
+        "date": record["date"],
+        "start_time": record["start_time"],
+        "end_time": record["end_time"],
+        "start_min": record["start_min"],
+        "end_min": record["end_min"],
+        "subject": record["subject"],
+        "instructor": record["instructor"],
+        "room": record["room"],
+        "group": record["group"],
+        "oddzial": record["oddzial"],
+        "type": record["type"],
+        "source": record["source"],
+    }
+    head_bytes = dumps(head)[:-1] + b","
+    tail_bytes = b'"color_hsl":' + dumps(record["color_hsl"]) + b"}"
+    return head_bytes, tail_bytes
+
+
+def event_json(fragments: tuple[bytes, bytes], layout_col: int, layout_cols_total: int) -> bytes:
+    head, tail = fragments
+    return b"%s\"layout_col\":%d,\"layout_cols_total\":%d,%s" % (head, layout_col, layout_cols_total, tail)
+
+
+def day_json(day_date: date, range_start_min: int, range_end_min: int, events: list[bytes]) -> bytes:
+    return b'{"date":"%s","range_start_min":%d,"range_end_min":%d,"events":[%s]}' % (
+        day_date.isoformat().encode("ascii"),
+        range_start_min,
+        range_end_min,
+        b",".join(events),
+    )
+
+
+def week_json(week_start: date, week_end: date, days: list[bytes]) -> bytes:
+    return b'{"week_start":"%s","week_end":"%s","days":[%s]}' % (
+        week_start.isoformat().encode("ascii"),
+        week_end.isoformat().encode("ascii"),
+        b",".join(days),
+    )
+
+
+def range_json_prefix(date_from: date, date_to: date) -> bytes:
+    """Opening of a ``RangeSchedule`` object; day objects and ``RANGE_JSON_SUFFIX`` follow."""
+    return b'{"date_from":"%s","date_to":"%s","days":[' % (
+        date_from.isoformat().encode("ascii"),
+        date_to.isoformat().encode("ascii"),
+    )
+
+
+RANGE_JSON_SUFFIX = b"]}"
+
+
+COMPACT_FORMAT_VERSION = 1
+COMPACT_EVENT_FIELDS = (
+    "id",
+    "start_time",
+    "end_time",
+    "start_min",
+    "end_min",
+    "subject",
+    "instructor",
+    "room",
+    "group",
+    "oddzial",
+    "type",
+    "source",
+    "color_hsl",
+    "layout_col",
+    "layout_cols_total",
+)
+"""Tuple layout of a compact event; the event ``date`` is the enclosing day's date."""
+
+COMPACT_STRING_FIELDS = (
+    "start_time",
+    "end_time",
+    "subject",
+    "instructor",
+    "room",
+    "group",
+    "oddzial",
+    "type",
+    "source",
+    "color_hsl",
+)
+"""Compact event fields sent as indexes into the response's ``strings`` table."""
+
+
+class StringTable:
+    """Dictionary encoder assigning each distinct string a stable index in first-seen order."""
+
+    def __init__(self) -> None:
+        self._indexes: dict[str, int] = {}
+        self.values: list[str] = []
+
+    def ref(self, value: str) -> int:
+        index = self._indexes.get(value)
+        if index is None:
+            index = len(self.values)
+            self._indexes[value] = index
+            self.values.append(value)
+        return index
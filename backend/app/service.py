@@ -1,80 +1,199 @@
 from __future__ import annotations
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import date, datetime, timedelta, timezone
-import hashlib
+from functools import partial
+import logging
 from pathlib import Path
 import threading
-from typing import Any, Literal
+import time
+from typing import Any, Callable, Iterator, Literal, TypeVar
+from zoneinfo import ZoneInfo
 
+import numpy as np
 import pandas as pd
+from starlette.concurrency import run_in_threadpool
 
+from .change_feed import ChangeFeed
+from .compiled_store import CompiledDataset, CompiledStore, source_content_hash
+from .compression import ResponseCompressor
 from .config import Settings
 from .data_loader import load_combined_data
 from .errors import DataSourceUnavailable
-from .filters import ScheduleFilters, apply_filters_with_magdalenka, extract_filter_values
-from .layout import assign_columns_and_clusters, compute_time_range
+from .filters import ScheduleFilters, extract_filter_values
+from .history import VersionEntry, VersionHistory, diff_versions
+from .icalendar import CALENDAR_FOOTER, calendar_header, format_utc, vevent
+from .layout import assign_columns_and_clusters, compute_minutes_range
 from .models import (
+    ChangedEvent,
     DaySchedule,
     FilterOptions,
     HealthResponse,
     MetaResponse,
+    ReadinessResponse,
     RuntimeSettingsResponse,
+    ScheduleChanges,
     ScheduleEvent,
     WeekSchedule,
 )
+from .response_cache import CacheStats, ResponseCache
 from .runtime_settings import RuntimeSettingsData, RuntimeSettingsStore, sanitize_excel_filename
-from .utils import normalize_text, subject_color_hsl, to_minutes
+from .serialization import (
+    COMPACT_EVENT_FIELDS,
+    COMPACT_FORMAT_VERSION,
+    RANGE_JSON_SUFFIX,
+    StringTable,
+    day_json,
+    dumps,
+    event_json,
+    range_json_prefix,
+    week_json,
+)
+from .single_flight import SingleFlight
+from .snapshot import DatasetSnapshot, build_snapshot
+from .watcher import FileWatcher, file_signature
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+ResponseSpec = tuple[tuple[object, ...], Callable[[], bytes]]
+"""Response cache key (without the snapshot version) and the function rendering its body."""
+
+MAX_RANGE_DAYS = 184
+"""Longest ``/schedule/range`` request, about one semester."""
+ICS_EVENTS_PER_CHUNK = 256
+
+
+@dataclass(frozen=True)
+class DayLayout:
+    day_date: date
+    range_start_min: int
+    range_end_min: int
+    events: list[tuple[int, int, int]]
+    """``(row position, layout_col, layout_cols_total)`` in display order."""
+
+
+def dataset_change_message(snapshot: DatasetSnapshot) -> dict[str, str]:
+    return {"version": snapshot.version, "loaded_at": snapshot.loaded_at.isoformat()}
+
+
+def week_start_for(anchor_date: date) -> date:
+    return anchor_date - timedelta(days=anchor_date.weekday())
 
 
 class ScheduleService:
     def __init__(self, settings: Settings) -> None:
         self._settings = settings
         self._lock = threading.Lock()
-
-        self._frame: pd.DataFrame | None = None
-        self._last_reload_at: datetime | None = None
+        self._refresh_requested = threading.Event()
+        self._stopped = threading.Event()
+        self._refresher: threading.Thread | None = None
+        self._executor_lock = threading.Lock()
+        self._io_executor: ThreadPoolExecutor | None = None
+
+        self._snapshot: DatasetSnapshot | None = None
+        self._last_checked_at: datetime | None = None
+        self._last_failed_at: datetime | None = None
+        self._last_error: str | None = None
         self._fingerprint: str | None = None
+        # Bumped by the file watcher; request handlers compare counters instead of stat()-ing files.
+        self._watch_version = 0
+        self._checked_watch_version = 0
+        self._last_load_seconds: float | None = None
+        self._meta_cache: tuple[str, MetaResponse, bytes] | None = None
+        self.change_feed = ChangeFeed(max_subscribers=self._settings.sse_max_subscribers)
+        self._response_cache = ResponseCache(
+            max_bytes=self._settings.response_cache_max_bytes,
+            ttl_seconds=self._settings.response_cache_ttl_seconds,
+        )
+        self._flights: SingleFlight[bytes] = SingleFlight()
+        self._history = VersionHistory(max_versions=self._settings.version_history_size)
+        self.compressor = ResponseCompressor(
+            # Separate from the JSON cache so its stats keep meaning "schedule renders". Encoded
+            # variants are several times smaller than the JSON they come from, hence the smaller budget.
+            ResponseCache(
+                max_bytes=self._settings.response_cache_max_bytes // 4,
+                ttl_seconds=self._settings.response_cache_ttl_seconds,
+            ),
+            min_bytes=self._settings.compression_min_bytes,
+        )
 
         self._settings.data_dir.mkdir(parents=True, exist_ok=True)
         self._runtime_store = RuntimeSettingsStore(
             data_dir=self._settings.data_dir,
             settings_file=self._settings.runtime_settings_file,
         )
-        self._runtime_data = self._runtime_store.load()
+        self._compiled_store = CompiledStore(self._settings.compiled_cache_dir)
+        self._watcher = FileWatcher(
+            tracked_files=self._watched_files,
+            on_change=self._on_files_changed,
+            poll_interval=self._settings.watch_poll_seconds,
+        )
 
     @property
     def settings(self) -> Settings:
         return self._settings
 
-    def _tracked_files(self) -> list[Path]:
+    def _tracked_files(self, runtime_data: RuntimeSettingsData) -> list[Path]:
         files = [
             self._settings.runtime_settings_file,
-            self._settings.data_dir / self._runtime_data.main_file,
-            self._settings.data_dir / self._runtime_data.practical_file,
+            self._settings.data_dir / runtime_data.main_file,
+            self._settings.data_dir / runtime_data.practical_file,
+            # Moved by whichever worker loads a new dataset first, so the others revalidate too.
+            self._compiled_store.pointer_path,
         ]
         return files
 
-    def _build_fingerprint(self) -> str:
-        chunks: list[str] = []
-        for path in self._tracked_files():
-            if path.exists():
-                stat = path.stat()
-                chunks.append(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}")
-            else:
-                chunks.append(f"{path.name}:missing")
-        return "|".join(chunks)
+    def _watched_files(self) -> list[Path]:
+        snapshot = self._snapshot
+        runtime_data = snapshot.runtime if snapshot is not None else self._runtime_store.load()
+        return self._tracked_files(runtime_data)
+
+    def _on_files_changed(self) -> None:
+        # The refresher re-reads the settings file (``_revalidate_locked``), never a request handler.
+        self._watch_version += 1
+        self._refresh_requested.set()
+
+    def _build_fingerprint(self, runtime_data: RuntimeSettingsData) -> str:
+        return file_signature(self._tracked_files(runtime_data))
+
+    def _source_hash(self, runtime_data: RuntimeSettingsData) -> str:
+        return source_content_hash(
+            [
+                self._settings.data_dir / runtime_data.main_file,
+                self._settings.data_dir / runtime_data.practical_file,
+            ]
+        )
 
     def _cache_expired(self, now: datetime) -> bool:
-        if self._last_reload_at is None:
+        last_attempt = self._last_checked_at
+        # A failed check is retried after the TTL as well, not on every request in between.
+        if self._last_failed_at is not None and (last_attempt is None or self._last_failed_at > last_attempt):
+            last_attempt = self._last_failed_at
+        if last_attempt is None:
             return True
-        return (now - self._last_reload_at).total_seconds() >= self._settings.cache_ttl_seconds
+        return (now - last_attempt).total_seconds() >= self._settings.cache_ttl_seconds
 
-    def _needs_reload(self, now: datetime) -> bool:
-        if self._frame is None:
+    def _needs_revalidation(self, snapshot: DatasetSnapshot | None, now: datetime) -> bool:
+        if snapshot is None:
             return True
-        if self._cache_expired(now):
+        if self._cache_expired(now) or self._watch_version != self._checked_watch_version:
             return True
-        return self._build_fingerprint() != self._fingerprint
+        return self._build_fingerprint(snapshot.runtime) != self._fingerprint
+
+    def _revalidate_locked(self, now: datetime) -> None:
+        """Reload only when the settings or the source file contents actually changed."""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            runtime_data = self._runtime_store.refresh()
+            if runtime_data == snapshot.runtime and self._source_hash(runtime_data) == snapshot.content_hash:
+                self._last_checked_at = now
+                self._fingerprint = self._build_fingerprint(runtime_data)
+                return
+        self._reload_locked()
 
     def _assert_runtime_files(self, runtime_data: RuntimeSettingsData) -> None:
         main_path = self._settings.data_dir / runtime_data.main_file
@@ -84,39 +203,163 @@ class ScheduleService:
         if not practical_path.exists():
             raise DataSourceUnavailable(f"Plik praktyk nie istnieje: {runtime_data.practical_file}")
 
-    def _invalidate_cache_locked(self) -> None:
-        self._frame = None
-        self._last_reload_at = None
-        self._fingerprint = None
-
-    def _reload_locked(self) -> None:
+    def _load_dataset(self, content_hash: str, runtime_data: RuntimeSettingsData) -> CompiledDataset:
+        dataset = self._compiled_store.load(content_hash)
+        if dataset is None:
+            # With several workers only one parses; the rest wait here and then load its output.
+            with self._compiled_store.loader_lock():
+                dataset = self._compiled_store.load(content_hash)
+                if dataset is None:
+                    frame = load_combined_data(
+                        self._settings.data_dir,
+                        main_file_name=runtime_data.main_file,
+                        practical_file_name=runtime_data.practical_file,
+                    )
+                    # Mapped back from disk, so the parsing worker shares the pages like the rest.
+                    if self._compiled_store.store(content_hash, frame):
+                        dataset = self._compiled_store.load(content_hash)
+                    if dataset is None:
+                        dataset = CompiledDataset.build(frame)
+        self._compiled_store.publish(content_hash)
+        return dataset
+
+    def _reload_locked(self) -> DatasetSnapshot:
+        started = time.perf_counter()
         runtime_data = self._runtime_store.load()
         self._assert_runtime_files(runtime_data)
 
-        frame = load_combined_data(
-            self._settings.data_dir,
-            main_file_name=runtime_data.main_file,
-            practical_file_name=runtime_data.practical_file,
-        )
-        self._runtime_data = runtime_data
-        self._frame = frame
-        self._last_reload_at = datetime.now(timezone.utc)
-        self._fingerprint = self._build_fingerprint()
-
-    def _ensure_loaded(self) -> pd.DataFrame:
+        content_hash = self._source_hash(runtime_data)
+        loaded_at = datetime.now(timezone.utc)
+        current = self._snapshot
+        if current is not None and current.content_hash == content_hash:
+            snapshot = current.with_runtime(runtime_data, loaded_at=loaded_at)
+        else:
+            dataset = self._load_dataset(content_hash, runtime_data)
+            snapshot = build_snapshot(
+                dataset.frame,
+                columns=dataset.columns,
+                runtime=runtime_data,
+                content_hash=content_hash,
+                loaded_at=loaded_at,
+            )
+        self._fingerprint = self._build_fingerprint(runtime_data)
+        self._last_checked_at = snapshot.loaded_at
+        self._last_load_seconds = time.perf_counter() - started
+        self._publish_locked(snapshot)
+        return snapshot
+
+    def _publish_locked(self, snapshot: DatasetSnapshot) -> None:
+        previous = self._snapshot
+        # Built on the loading thread before the swap, so async handlers never run pandas for meta.
+        self._meta_entry(snapshot)
+        self._snapshot = snapshot
+        self._response_cache.clear()
+        self.compressor.clear()
+        self._history.record(snapshot)
+        if previous is not None and previous.version != snapshot.version:
+            self.change_feed.publish(dataset_change_message(snapshot))
+
+    def _refresh_once(self) -> None:
         now = datetime.now(timezone.utc)
-        if not self._needs_reload(now):
-            return self._frame if self._frame is not None else pd.DataFrame()
-
         with self._lock:
-            if self._needs_reload(now):
-                self._reload_locked()
-
-        return self._frame if self._frame is not None else pd.DataFrame()
-
-    def _runtime_response(self) -> RuntimeSettingsResponse:
-        runtime_data = self._runtime_store.load()
-        self._runtime_data = runtime_data
+            snapshot = self._snapshot
+            if snapshot is None or not self._needs_revalidation(snapshot, now):
+                return
+            watch_version = self._watch_version
+            try:
+                self._revalidate_locked(now)
+            except Exception as exc:
+                # Keep serving the previous snapshot; retry on the next TTL tick or file change.
+                logger.exception("Background revalidation failed")
+                self._last_failed_at = now
+                self._last_error = str(exc) or type(exc).__name__
+            else:
+                self._last_error = None
+            self._checked_watch_version = watch_version
+
+    def _refresh_loop(self) -> None:
+        while not self._stopped.is_set():
+            self._refresh_requested.wait(timeout=self._settings.cache_ttl_seconds)
+            self._refresh_requested.clear()
+            if self._stopped.is_set():
+                break
+            self._refresh_once()
+
+    def start(self) -> None:
+        """Start the refresher and the file watcher; whoever starts them must call ``stop``.
+
+        Only the app lifespan does: a watcher thread still running at interpreter exit can crash
+        the process, so loading a snapshot never starts threads by itself.
+        """
+        with self._lock:
+            if self._refresher is not None:
+                return
+            self._stopped.clear()
+            self._refresher = threading.Thread(target=self._refresh_loop, name="schedule-refresher", daemon=True)
+            self._refresher.start()
+            self._watcher.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._refresh_requested.set()
+        self._watcher.stop()
+        refresher = self._refresher
+        if refresher is not None:
+            refresher.join(timeout=5)
+        self._refresher = None
+        with self._executor_lock:
+            executor, self._io_executor = self._io_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    async def run_io(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run blocking parsing or file I/O on the service's bounded executor, off the event loop."""
+        # Not ``self._lock``: that one is held for whole reloads and would stall the event loop.
+        with self._executor_lock:
+            if self._io_executor is None:
+                self._io_executor = ThreadPoolExecutor(
+                    max_workers=self._settings.io_workers,
+                    thread_name_prefix="schedule-io",
+                )
+            executor = self._io_executor
+        return await asyncio.get_running_loop().run_in_executor(executor, partial(func, *args, **kwargs))
+
+    def _ensure_loaded(self) -> DatasetSnapshot:
+        """Return the published snapshot; stale data is served while the refresher revalidates it."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._snapshot or self._reload_locked()
+            return snapshot
+
+        # No file system access here: the watcher reports changes, the refresher stat()s and hashes.
+        if self._watch_version != self._checked_watch_version or self._cache_expired(datetime.now(timezone.utc)):
+            self._refresh_requested.set()
+        return snapshot
+
+    def snapshot(self) -> DatasetSnapshot:
+        return self._ensure_loaded()
+
+    def warm_up(self) -> DatasetSnapshot:
+        """Load the dataset and the per-version meta before the app reports ready."""
+        snapshot = self._ensure_loaded()
+        self.meta_json(snapshot)
+        return snapshot
+
+    async def snapshot_async(self) -> DatasetSnapshot:
+        """``snapshot`` for async handlers: only the very first load leaves the event loop."""
+        if self._snapshot is None:
+            return await self.run_io(self._ensure_loaded)
+        return self._ensure_loaded()
+
+    def runtime_settings_data(self) -> RuntimeSettingsData:
+        return self._runtime_store.load()
+
+    def runtime_settings_json(self, runtime_data: RuntimeSettingsData) -> bytes:
+        return self._runtime_response(runtime_data).model_dump_json().encode("utf-8")
+
+    def _runtime_response(self, runtime_data: RuntimeSettingsData | None = None) -> RuntimeSettingsResponse:
+        runtime_data = runtime_data or self._runtime_store.load()
         return RuntimeSettingsResponse(
             main_file=runtime_data.main_file,
             practical_file=runtime_data.practical_file,
@@ -135,21 +378,21 @@ class ScheduleService:
         magdalenka_exact_groups: list[str] | None = None,
         magdalenka_prefixes: list[str] | None = None,
     ) -> RuntimeSettingsResponse:
-        next_data = self._runtime_store.compose(
+        def check_files(next_data: RuntimeSettingsData) -> None:
+            try:
+                self._assert_runtime_files(next_data)
+            except DataSourceUnavailable as exc:
+                raise ValueError(str(exc)) from exc
+
+        self._runtime_store.update(
             main_file=main_file,
             practical_file=practical_file,
             magdalenka_exact_groups=magdalenka_exact_groups,
             magdalenka_prefixes=magdalenka_prefixes,
+            validate=check_files,
         )
-        try:
-            self._assert_runtime_files(next_data)
-        except DataSourceUnavailable as exc:
-            raise ValueError(str(exc)) from exc
-        self._runtime_store.save(next_data)
 
         with self._lock:
-            self._runtime_data = next_data
-            self._invalidate_cache_locked()
             self._reload_locked()
         return self._runtime_response()
 
@@ -168,27 +411,60 @@ class ScheduleService:
         target.write_bytes(content)
 
         if kind == "main":
-            updated = self._runtime_store.update(main_file=safe_name)
+            self._runtime_store.update(main_file=safe_name)
         else:
-            updated = self._runtime_store.update(practical_file=safe_name)
+            self._runtime_store.update(practical_file=safe_name)
 
         with self._lock:
-            self._runtime_data = updated
-            self._invalidate_cache_locked()
             self._reload_locked()
         return self._runtime_response()
 
-    def health(self) -> HealthResponse:
-        frame = self._ensure_loaded()
+    def health(self, snapshot: DatasetSnapshot | None = None) -> HealthResponse:
+        snapshot = snapshot or self._ensure_loaded()
+        last_error = self._last_error
         return HealthResponse(
-            status="ok",
-            last_reload_at=self._last_reload_at,
+            status="ok" if last_error is None else "degraded",
+            last_reload_at=snapshot.loaded_at,
+            last_checked_at=self._last_checked_at,
+            last_failed_at=self._last_failed_at,
+            last_error=last_error,
             cache_ttl_seconds=self._settings.cache_ttl_seconds,
-            records=len(frame),
+            records=snapshot.records,
+        )
+
+    def readiness(self) -> ReadinessResponse:
+        """Readiness from the published snapshot only; never loads or revalidates anything."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return ReadinessResponse(status="loading")
+        load_seconds = self._last_load_seconds
+        return ReadinessResponse(
+            status="ready",
+            version=snapshot.version,
+            loaded_at=snapshot.loaded_at,
+            load_duration_ms=round(load_seconds * 1000, 1) if load_seconds is not None else None,
+            records=snapshot.records,
         )
 
+    def _meta_entry(self, snapshot: DatasetSnapshot | None = None) -> tuple[MetaResponse, bytes]:
+        """Meta only changes with the dataset, so it is built and serialized once per snapshot version."""
+        snapshot = snapshot or self._ensure_loaded()
+        cached = self._meta_cache
+        if cached is not None and cached[0] == snapshot.version:
+            return cached[1], cached[2]
+
+        response = self._build_meta(snapshot.frame)
+        body = response.model_dump_json().encode("utf-8")
+        self._meta_cache = (snapshot.version, response, body)
+        return response, body
+
     def meta(self) -> MetaResponse:
-        frame = self._ensure_loaded()
+        return self._meta_entry()[0]
+
+    def meta_json(self, snapshot: DatasetSnapshot | None = None) -> bytes:
+        return self._meta_entry(snapshot)[1]
+
+    def _build_meta(self, frame: pd.DataFrame) -> MetaResponse:
         filters = extract_filter_values(frame)
 
         min_date = None
@@ -208,123 +484,364 @@ class ScheduleService:
             filters=FilterOptions(**filters),
         )
 
-    def _filtered_frame(self, filters: ScheduleFilters) -> pd.DataFrame:
-        frame = self._ensure_loaded()
-        if frame.empty:
-            return frame
-        return apply_filters_with_magdalenka(
-            frame,
+    @staticmethod
+    def _matching_positions(snapshot: DatasetSnapshot, start: int, stop: int, filters: ScheduleFilters) -> np.ndarray:
+        mask = snapshot.filters.mask(
             filters,
-            magdalenka_exact_groups=self._runtime_data.magdalenka_exact_groups,
-            magdalenka_prefixes=self._runtime_data.magdalenka_prefixes,
+            start=start,
+            stop=stop,
+            magdalenka_exact_groups=snapshot.runtime.magdalenka_exact_groups,
+            magdalenka_prefixes=snapshot.runtime.magdalenka_prefixes,
         )
+        return start + np.flatnonzero(mask)
 
-    @staticmethod
-    def _event_id(payload: str) -> str:
-        return hashlib.md5(payload.encode("utf-8")).hexdigest()[:16]
-
-    def _serialize_day(self, day_date: date, filtered_df: pd.DataFrame) -> DaySchedule:
-        if filtered_df.empty:
-            return DaySchedule(date=day_date, range_start_min=7 * 60, range_end_min=21 * 60, events=[])
-
-        day_df = filtered_df[filtered_df["date"].dt.date == day_date]
-        range_start_min, range_end_min = compute_time_range(day_df, compact=True)
-        if day_df.empty:
-            return DaySchedule(
-                date=day_date,
-                range_start_min=range_start_min,
-                range_end_min=range_end_min,
-                events=[],
-            )
-
-        raw_events: list[dict[str, Any]] = []
-        for row in day_df.to_dict("records"):
-            start_obj = row.get("start_time_obj")
-            end_obj = row.get("end_time_obj")
-            if pd.isna(start_obj) or pd.isna(end_obj):
-                continue
+    def _iter_day_layouts(
+        self,
+        snapshot: DatasetSnapshot,
+        first: date,
+        last: date,
+        filters: ScheduleFilters,
+    ) -> Iterator[DayLayout]:
+        """Filter only the rows between ``first`` and ``last`` and lay them out per day."""
+        start, stop = snapshot.dates.bounds(first, last)
+        positions = self._matching_positions(snapshot, start, stop, filters)
+
+        day_date = first
+        while day_date <= last:
+            day_start, day_stop = snapshot.dates.day(day_date)
+            lower, upper = np.searchsorted(positions, [day_start, day_stop])
+            yield self._layout_day(snapshot, day_date, positions[lower:upper])
+            day_date += timedelta(days=1)
 
-            start_min = to_minutes(start_obj)
-            end_min = to_minutes(end_obj)
-            if end_min <= start_min:
-                continue
+    @staticmethod
+    def _layout_day(snapshot: DatasetSnapshot, day_date: date, positions: np.ndarray) -> DayLayout:
+        table = snapshot.events
+        start_values = table.start_min[positions]
+        end_values = table.end_min[positions]
+        range_start_min, range_end_min = compute_minutes_range(
+            start_values[start_values >= 0].tolist(),
+            end_values[end_values >= 0].tolist(),
+            compact=True,
+        )
 
-            raw_events.append(
-                {
-                    "start_min": start_min,
-                    "end_min": end_min,
-                    "subject": normalize_text(row.get("subject")),
-                    "instructor": normalize_text(row.get("instructor")),
-                    "room": normalize_text(row.get("room")),
-                    "group": normalize_text(row.get("group")),
-                    "oddzial": normalize_text(row.get("oddzial")),
-                    "type": normalize_text(row.get("type")),
-                    "source": normalize_text(row.get("source")),
-                    "start_time": normalize_text(row.get("start_time")),
-                    "end_time": normalize_text(row.get("end_time")),
-                }
-            )
+        records = table.records
+        event_positions = [position for position in positions.tolist() if records[position] is not None]
+        event_positions.sort(key=lambda position: (records[position]["start_min"], records[position]["end_min"]))
+        positioned_events, cluster_cols = assign_columns_and_clusters([records[position] for position in event_positions])
 
-        raw_events.sort(key=lambda item: (item["start_min"], item["end_min"]))
-        positioned_events, cluster_cols = assign_columns_and_clusters(raw_events)
-
-        serialized_events: list[ScheduleEvent] = []
-        for event in positioned_events:
-            start_time = event["start_time"] or f"{event['start_min'] // 60:02d}:{event['start_min'] % 60:02d}"
-            end_time = event["end_time"] or f"{event['end_min'] // 60:02d}:{event['end_min'] % 60:02d}"
-            event_identity = "|".join(
-                [
-                    day_date.isoformat(),
-                    start_time,
-                    end_time,
-                    event["subject"],
-                    event["room"],
-                    event["group"],
-                    event["source"],
-                    event["instructor"],
-                ]
-            )
+        return DayLayout(
+            day_date=day_date,
+            range_start_min=range_start_min,
+            range_end_min=range_end_min,
+            events=[
+                (position, event["col"], max(1, cluster_cols.get(event["cluster_id"], 1)))
+                for position, event in zip(event_positions, positioned_events)
+            ],
+        )
 
-            serialized_events.append(
+    @staticmethod
+    def _day_model(snapshot: DatasetSnapshot, layout: DayLayout) -> DaySchedule:
+        records = snapshot.events.records
+        events: list[ScheduleEvent] = []
+        for position, layout_col, layout_cols_total in layout.events:
+            record = records[position]
+            events.append(
                 ScheduleEvent(
-                    id=self._event_id(event_identity),
-                    date=day_date,
-                    start_time=start_time,
-                    end_time=end_time,
-                    start_min=event["start_min"],
-                    end_min=event["end_min"],
-                    subject=event["subject"],
-                    instructor=event["instructor"],
-                    room=event["room"],
-                    group=event["group"],
-                    oddzial=event["oddzial"],
-                    type=event["type"],
-                    source=event["source"],
-                    layout_col=event["col"],
-                    layout_cols_total=max(1, cluster_cols.get(event["cluster_id"], 1)),
-                    color_hsl=subject_color_hsl(event["subject"]),
+                    id=record["id"],
+                    date=record["date"],
+                    start_time=record["start_time"],
+                    end_time=record["end_time"],
+                    start_min=record["start_min"],
+                    end_min=record["end_min"],
+                    subject=record["subject"],
+                    instructor=record["instructor"],
+                    room=record["room"],
+                    group=record["group"],
+                    oddzial=record["oddzial"],
+                    type=record["type"],
+                    source=record["source"],
+                    layout_col=layout_col,
+                    layout_cols_total=layout_cols_total,
+                    color_hsl=record["color_hsl"],
                 )
             )
 
         return DaySchedule(
-            date=day_date,
-            range_start_min=range_start_min,
-            range_end_min=range_end_min,
-            events=serialized_events,
+            date=layout.day_date,
+            range_start_min=layout.range_start_min,
+            range_end_min=layout.range_end_min,
+            events=events,
+        )
+
+    @staticmethod
+    def _day_bytes(snapshot: DatasetSnapshot, layout: DayLayout) -> bytes:
+        """Fast path: the ``_day_model`` JSON written straight from pre-encoded event fragments."""
+        fragments = snapshot.events.fragments
+        return day_json(
+            layout.day_date,
+            layout.range_start_min,
+            layout.range_end_min,
+            [
+                event_json(fragments[position], layout_col, layout_cols_total)
+                for position, layout_col, layout_cols_total in layout.events
+            ],
+        )
+
+    def response_cache_stats(self) -> CacheStats:
+        return self._response_cache.stats()
+
+    def _cached_json(self, snapshot: DatasetSnapshot, key: tuple[object, ...], build: Callable[[], bytes]) -> bytes:
+        cache_key = (snapshot.version, *key)
+        body = self._response_cache.get(cache_key)
+        if body is None:
+            body = self._flights.do(cache_key, partial(self._build_cached, snapshot, cache_key, build))
+        return body
+
+    async def _cached_json_async(
+        self,
+        snapshot: DatasetSnapshot,
+        key: tuple[object, ...],
+        build: Callable[[], bytes],
+    ) -> bytes:
+        """Hits are answered on the loop; a miss renders once in the threadpool for all identical waiters.
+
+        Renders do not use ``run_io``: right after an upload that executor is busy parsing Excel,
+        exactly when the emptied cache sends a burst of distinct misses.
+        """
+        cache_key = (snapshot.version, *key)
+        body = self._response_cache.get(cache_key)
+        if body is None:
+            body = await self._flights.do_async(
+                cache_key,
+                partial(self._build_cached, snapshot, cache_key, build),
+                run_in_threadpool,
+            )
+        return body
+
+    def _build_cached(self, snapshot: DatasetSnapshot, cache_key: tuple[object, ...], build: Callable[[], bytes]) -> bytes:
+        body = build()
+        if self._snapshot is snapshot:
+            self._response_cache.put(cache_key, body)
+        return body
+
+    def _day_spec(self, snapshot: DatasetSnapshot, day_date: date, filters: ScheduleFilters) -> ResponseSpec:
+        return (
+            ("day", filters, day_date),
+            lambda: self._day_bytes(snapshot, next(self._iter_day_layouts(snapshot, day_date, day_date, filters))),
         )
 
+    def _week_spec(
+        self,
+        snapshot: DatasetSnapshot,
+        anchor_date: date,
+        filters: ScheduleFilters,
+        compact: bool,
+    ) -> ResponseSpec:
+        week_start = week_start_for(anchor_date)
+        if compact:
+            return (
+                ("week-compact", filters, week_start),
+                lambda: self._compact_week_bytes(snapshot, week_start, filters),
+            )
+        return ("week", filters, week_start), lambda: self._week_bytes(snapshot, week_start, filters)
+
+    def day_schedule_json(
+        self,
+        day_date: date,
+        filters: ScheduleFilters,
+        snapshot: DatasetSnapshot | None = None,
+    ) -> bytes:
+        snapshot = snapshot or self._ensure_loaded()
+        return self._cached_json(snapshot, *self._day_spec(snapshot, day_date, filters))
+
+    async def day_schedule_json_async(self, day_date: date, filters: ScheduleFilters, snapshot: DatasetSnapshot) -> bytes:
+        return await self._cached_json_async(snapshot, *self._day_spec(snapshot, day_date, filters))
+
+    def week_schedule_json(
+        self,
+        anchor_date: date,
+        filters: ScheduleFilters,
+        snapshot: DatasetSnapshot | None = None,
+        *,
+        compact: bool = False,
+    ) -> bytes:
+        snapshot = snapshot or self._ensure_loaded()
+        return self._cached_json(snapshot, *self._week_spec(snapshot, anchor_date, filters, compact))
+
+    async def week_schedule_json_async(
+        self,
+        anchor_date: date,
+        filters: ScheduleFilters,
+        snapshot: DatasetSnapshot,
+        *,
+        compact: bool = False,
+    ) -> bytes:
+        return await self._cached_json_async(snapshot, *self._week_spec(snapshot, anchor_date, filters, compact))
+
     def get_day_schedule(self, day_date: date, filters: ScheduleFilters) -> DaySchedule:
-        filtered_df = self._filtered_frame(filters)
-        return self._serialize_day(day_date=day_date, filtered_df=filtered_df)
+        snapshot = self._ensure_loaded()
+        return self._day_model(snapshot, next(self._iter_day_layouts(snapshot, day_date, day_date, filters)))
 
     def get_week_schedule(self, anchor_date: date, filters: ScheduleFilters) -> WeekSchedule:
-        filtered_df = self._filtered_frame(filters)
-        week_start = anchor_date - timedelta(days=anchor_date.weekday())
+        snapshot = self._ensure_loaded()
+        week_start = week_start_for(anchor_date)
         week_end = week_start + timedelta(days=6)
+        days = [
+            self._day_model(snapshot, layout)
+            for layout in self._iter_day_layouts(snapshot, week_start, week_end, filters)
+        ]
+        return WeekSchedule(week_start=week_start, week_end=week_end, days=days)
 
-        days: list[DaySchedule] = []
-        for offset in range(7):
-            day_date = week_start + timedelta(days=offset)
-            days.append(self._serialize_day(day_date=day_date, filtered_df=filtered_df))
+    def _week_bytes(self, snapshot: DatasetSnapshot, week_start: date, filters: ScheduleFilters) -> bytes:
+        week_end = week_start + timedelta(days=6)
+        days = [
+            self._day_bytes(snapshot, layout)
+            for layout in self._iter_day_layouts(snapshot, week_start, week_end, filters)
+        ]
+        return week_json(week_start, week_end, days)
 
-        return WeekSchedule(week_start=week_start, week_end=week_end, days=days)
+    def _compact_week_bytes(self, snapshot: DatasetSnapshot, week_start: date, filters: ScheduleFilters) -> bytes:
+        """Week payload with repeated strings sent once and events as ``COMPACT_EVENT_FIELDS`` tuples."""
+        week_end = week_start + timedelta(days=6)
+        records = snapshot.events.records
+        strings = StringTable()
+        days: list[dict[str, object]] = []
+        for layout in self._iter_day_layouts(snapshot, week_start, week_end, filters):
+            events: list[list[object]] = []
+            for position, layout_col, layout_cols_total in layout.events:
+                record = records[position]
+                events.append(
+                    [
+                        record["id"],
+                        strings.ref(record["start_time"]),
+                        strings.ref(record["end_time"]),
+                        record["start_min"],
+                        record["end_min"],
+                        strings.ref(record["subject"]),
+                        strings.ref(record["instructor"]),
+                        strings.ref(record["room"]),
+                        strings.ref(record["group"]),
+                        strings.ref(record["oddzial"]),
+                        strings.ref(record["type"]),
+                        strings.ref(record["source"]),
+                        strings.ref(record["color_hsl"]),
+                        layout_col,
+                        layout_cols_total,
+                    ]
+                )
+            days.append(
+                {
+                    "date": layout.day_date.isoformat(),
+                    "range_start_min": layout.range_start_min,
+                    "range_end_min": layout.range_end_min,
+                    "events": events,
+                }
+            )
+
+        return dumps(
+            {
+                "format": "compact",
+                "version": COMPACT_FORMAT_VERSION,
+                "week_start": week_start.isoformat(),
+                "week_end": week_end.isoformat(),
+                "fields": COMPACT_EVENT_FIELDS,
+                "strings": strings.values,
+                "days": days,
+            }
+        )
+
+    def iter_range_json(
+        self,
+        first: date,
+        last: date,
+        filters: ScheduleFilters,
+        snapshot: DatasetSnapshot | None = None,
+    ) -> Iterator[bytes]:
+        """``RangeSchedule`` JSON in per-day chunks, so memory stays flat for long ranges."""
+        if last < first:
+            raise ValueError("Data koncowa nie moze byc wczesniejsza niz poczatkowa.")
+        if (last - first).days + 1 > MAX_RANGE_DAYS:
+            raise ValueError(f"Zakres moze obejmowac maksymalnie {MAX_RANGE_DAYS} dni.")
+
+        snapshot = snapshot or self._ensure_loaded()
+        return self._range_chunks(snapshot, first, last, filters)
+
+    def _range_chunks(
+        self,
+        snapshot: DatasetSnapshot,
+        first: date,
+        last: date,
+        filters: ScheduleFilters,
+    ) -> Iterator[bytes]:
+        yield range_json_prefix(first, last)
+        separator = b""
+        for layout in self._iter_day_layouts(snapshot, first, last, filters):
+            yield separator + self._day_bytes(snapshot, layout)
+            separator = b","
+        yield RANGE_JSON_SUFFIX
+
+    def schedule_changes_json(
+        self,
+        since: str,
+        filters: ScheduleFilters,
+        snapshot: DatasetSnapshot | None = None,
+    ) -> bytes | None:
+        """Events added, removed or modified since ``since``; ``None`` once that version left the history."""
+        snapshot = snapshot or self._ensure_loaded()
+        spec = self._changes_spec(snapshot, since, filters)
+        return self._cached_json(snapshot, *spec) if spec is not None else None
+
+    async def schedule_changes_json_async(
+        self,
+        since: str,
+        filters: ScheduleFilters,
+        snapshot: DatasetSnapshot,
+    ) -> bytes | None:
+        spec = self._changes_spec(snapshot, since, filters)
+        return await self._cached_json_async(snapshot, *spec) if spec is not None else None
+
+    def _changes_spec(self, snapshot: DatasetSnapshot, since: str, filters: ScheduleFilters) -> ResponseSpec | None:
+        previous = self._history.get(since)
+        if previous is None:
+            return None
+        return (
+            ("changes", since, filters),
+            lambda: self._build_changes(previous, snapshot, filters).model_dump_json().encode("utf-8"),
+        )
+
+    @staticmethod
+    def _build_changes(previous: VersionEntry, snapshot: DatasetSnapshot, filters: ScheduleFilters) -> ScheduleChanges:
+        changes = diff_versions(previous, VersionEntry.of(snapshot), filters)
+        return ScheduleChanges(
+            since=previous.version,
+            version=snapshot.version,
+            added=[ChangedEvent.model_validate(record) for record in changes.added],
+            removed=changes.removed,
+            modified=[ChangedEvent.model_validate(record) for record in changes.modified],
+        )
+
+    def cached_calendar_ics(self, filters: ScheduleFilters, snapshot: DatasetSnapshot) -> bytes | None:
+        return self._response_cache.get((snapshot.version, "ics", filters))
+
+    def iter_calendar_ics(self, filters: ScheduleFilters, snapshot: DatasetSnapshot) -> Iterator[bytes]:
+        """Stream the iCalendar feed for ``filters`` and cache the full body once it is complete."""
+        zone = ZoneInfo(self._settings.timezone)
+        stamp = format_utc(snapshot.loaded_at)
+        records = snapshot.events.records
+        positions = self._matching_positions(snapshot, 0, snapshot.records, filters)
+
+        chunks = [calendar_header("Plan zajec", self._settings.timezone)]
+        yield chunks[0]
+        for offset in range(0, len(positions), ICS_EVENTS_PER_CHUNK):
+            chunk = b"".join(
+                vevent(records[position], zone=zone, stamp=stamp)
+                for position in positions[offset : offset + ICS_EVENTS_PER_CHUNK].tolist()
+                if records[position] is not None
+            )
+            chunks.append(chunk)
+            yield chunk
+        chunks.append(CALENDAR_FOOTER)
+        yield CALENDAR_FOOTER
+
+        if self._snapshot is snapshot:
+            self._response_cache.put((snapshot.version, "ics", filters), b"".join(chunks))
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Future
+from functools import partial
+import threading
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Coalesces concurrent calls with the same key into one execution whose result all callers share.
+
+    Thread and asyncio callers join the same flights. A key is forgotten as soon as its call
+    finishes, so later calls run again (results are cached elsewhere, not here).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future[T]] = {}
+
+    def _join(self, key: Hashable) -> tuple[Future[T], bool]:
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def _execute(self, key: Hashable, future: Future[T], func: Callable[[], T]) -> None:
+        # Running futures cannot be cancelled, so one impatient waiter never fails the others.
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(func())
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> T:
+        future, leader = self._join(key)
+        if leader:
+            self._execute(key, future, func)
+        return future.result()
+
+    async def do_async(
+        self,
+        key: Hashable,
+        func: Callable[[], T],
+        run: Callable[[Callable[[], None]], Awaitable[None]],
+    ) -> T:
+        """Like ``do``, but the leader hands ``func`` to ``run`` (an executor) and nobody blocks the loop.
+
+        The flight completes even if the leading request is cancelled mid-way.
+        """
+        future, leader = self._join(key)
+        if leader:
+            try:
+                await asyncio.shield(run(partial(self._execute, key, future, func)))
+            except Exception as exc:
+                # ``_execute`` never raises, so ``run`` itself failed and the call was never scheduled.
+                if not future.running() and not future.done():
+                    self._execute(key, future, partial(_reraise, exc))
+                raise
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+
+def _reraise(exc: BaseException) -> None:
+    raise exc
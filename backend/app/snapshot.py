@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from datetime import date, datetime
+import hashlib
+import json
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .filters import FilterIndex
+from .runtime_settings import RuntimeSettingsData
+from .serialization import event_fragments
+from .utils import normalize_text_series, parse_time_series, subject_color_hsl
+
+EVENT_TEXT_FIELDS = ("subject", "instructor", "room", "group", "oddzial", "type", "source")
+
+
+def event_id(payload: str) -> str:
+    return hashlib.md5(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _format_minutes(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+@dataclass(frozen=True, eq=False)
+class DateIndex:
+    """Row-offset ranges per day over a frame sorted by date."""
+
+    row_days: np.ndarray
+    partitions: dict[date, tuple[int, int]]
+
+    @classmethod
+    def build(cls, dates: pd.Series) -> DateIndex:
+        return cls.from_days(dates.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]"))
+
+    @classmethod
+    def from_days(cls, row_days: np.ndarray) -> DateIndex:
+        unique_days, starts, counts = np.unique(row_days, return_index=True, return_counts=True)
+        partitions = {
+            day.item(): (int(start), int(start + count))
+            for day, start, count in zip(unique_days, starts, counts)
+        }
+        return cls(row_days=row_days, partitions=partitions)
+
+    def day(self, day_date: date) -> tuple[int, int]:
+        return self.partitions.get(day_date, (0, 0))
+
+    def bounds(self, first: date, last: date) -> tuple[int, int]:
+        """Row offsets covering ``first``..``last`` inclusive."""
+        start = int(np.searchsorted(self.row_days, np.datetime64(first, "D"), side="left"))
+        stop = int(np.searchsorted(self.row_days, np.datetime64(last, "D"), side="right"))
+        return start, max(start, stop)
+
+
+@dataclass(frozen=True, eq=False)
+class EventTable:
+    """Request-ready event fields for every snapshot row, computed once at load time.
+
+    ``records`` holds ``None`` for rows without a usable time span; ``start_min``/``end_min``
+    keep ``-1`` for missing times so day ranges still see every row with a valid time.
+    """
+
+    records: tuple[dict[str, Any] | None, ...]
+    fragments: tuple[tuple[bytes, bytes] | None, ...]
+    start_min: np.ndarray
+    end_min: np.ndarray
+
+    @classmethod
+    def build(
+        cls,
+        frame: pd.DataFrame,
+        *,
+        start_min: np.ndarray | None = None,
+        end_min: np.ndarray | None = None,
+    ) -> EventTable:
+        if start_min is None:
+            start_min = parse_time_series(frame["start_time_obj"]).minutes
+        if end_min is None:
+            end_min = parse_time_series(frame["end_time_obj"]).minutes
+        texts = {column: normalize_text_series(frame[column]).tolist() for column in EVENT_TEXT_FIELDS}
+        start_texts = normalize_text_series(frame["start_time"]).tolist()
+        end_texts = normalize_text_series(frame["end_time"]).tolist()
+        row_dates = [value.date() for value in frame["date"]]
+
+        colors: dict[str, str] = {}
+        records: list[dict[str, Any] | None] = []
+        for position, day_date in enumerate(row_dates):
+            start, end = int(start_min[position]), int(end_min[position])
+            if start < 0 or end < 0 or end <= start:
+                records.append(None)
+                continue
+
+            fields = {column: values[position] for column, values in texts.items()}
+            start_time = start_texts[position] or _format_minutes(start)
+            end_time = end_texts[position] or _format_minutes(end)
+            identity = "|".join(
+                [
+                    day_date.isoformat(),
+                    start_time,
+                    end_time,
+                    fields["subject"],
+                    fields["room"],
+                    fields["group"],
+                    fields["source"],
+                    fields["instructor"],
+                ]
+            )
+            subject = fields["subject"]
+            if subject not in colors:
+                colors[subject] = subject_color_hsl(subject)
+
+            records.append(
+                {
+                    "id": event_id(identity),
+                    "date": day_date.isoformat(),
+                    "start_time": start_time,
+                    "end_time": end_time,
+                    "start_min": start,
+                    "end_min": end,
+                    **fields,
+                    "color_hsl": colors[subject],
+                }
+            )
+
+        fragments = tuple(event_fragments(record) if record is not None else None for record in records)
+        return cls(records=tuple(records), fragments=fragments, start_min=start_min, end_min=end_min)
+
+
+@dataclass(frozen=True, eq=False)
+class SnapshotColumns:
+    """Numeric indexes over a date-sorted frame.
+
+    The compiled store keeps them on disk and maps them read-only, so every worker
+    process shares one copy of these pages instead of rebuilding its own.
+    """
+
+    row_days: np.ndarray
+    start_min: np.ndarray
+    end_min: np.ndarray
+    postings: dict[str, dict[str, np.ndarray]]
+
+    @classmethod
+    def build(cls, frame: pd.DataFrame) -> SnapshotColumns:
+        return cls(
+            row_days=frame["date"].to_numpy(dtype="datetime64[ns]").astype("datetime64[D]"),
+            start_min=parse_time_series(frame["start_time_obj"]).minutes,
+            end_min=parse_time_series(frame["end_time_obj"]).minutes,
+            postings=FilterIndex.build(frame).postings,
+        )
+
+
+def sort_by_date(frame: pd.DataFrame) -> pd.DataFrame:
+    return frame.sort_values(by="date", kind="stable").reset_index(drop=True)
+
+
+@dataclass(frozen=True, eq=False)
+class DatasetSnapshot:
+    """Everything a request reads, published as one object so readers never mix generations."""
+
+    frame: pd.DataFrame
+    dates: DateIndex
+    events: EventTable
+    filters: FilterIndex
+    runtime: RuntimeSettingsData
+    content_hash: str
+    loaded_at: datetime
+    version: str
+
+    @property
+    def records(self) -> int:
+        return len(self.frame)
+
+    def magdalenka_mask(self) -> np.ndarray:
+        return self.filters.magdalenka_mask(
+            magdalenka_exact_groups=self.runtime.magdalenka_exact_groups,
+            magdalenka_prefixes=self.runtime.magdalenka_prefixes,
+        )
+
+    def with_runtime(self, runtime: RuntimeSettingsData, *, loaded_at: datetime) -> DatasetSnapshot:
+        """Same data under new runtime settings; indexes and cached masks are shared."""
+        snapshot = replace(
+            self,
+            runtime=runtime,
+            loaded_at=loaded_at,
+            version=snapshot_version(self.content_hash, runtime),
+        )
+        snapshot.magdalenka_mask()
+        return snapshot
+
+
+def snapshot_version(content_hash: str, runtime: RuntimeSettingsData) -> str:
+    payload = json.dumps(runtime.to_payload(), ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(f"{content_hash}|{payload}".encode("utf-8")).hexdigest()[:16]
+
+
+def build_snapshot(
+    frame: pd.DataFrame,
+    *,
+    runtime: RuntimeSettingsData,
+    content_hash: str,
+    loaded_at: datetime,
+    columns: SnapshotColumns | None = None,
+) -> DatasetSnapshot:
+    """Index ``frame`` for requests; with ``columns`` the frame must already be sorted by date."""
+    if columns is None:
+        frame = sort_by_date(frame)
+        columns = SnapshotColumns.build(frame)
+    snapshot = DatasetSnapshot(
+        frame=frame,
+        dates=DateIndex.from_days(columns.row_days),
+        events=EventTable.build(frame, start_min=columns.start_min, end_min=columns.end_min),
+        filters=FilterIndex(size=len(frame), postings=columns.postings),
+        runtime=runtime,
+        content_hash=content_hash,
+        loaded_at=loaded_at,
+        version=snapshot_version(content_hash, runtime),
+    )
+    snapshot.magdalenka_mask()
+    return snapshot
@@ -1,14 +1,25 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime, time as dtime
+from functools import lru_cache
 import hashlib
+from numbers import Real
 from typing import Any, Iterable
 
+import numpy as np
 import pandas as pd
 
+SECONDS_PER_DAY = 24 * 60 * 60
+CLOCK_PATTERN = r"^([0-9]{1,2}):([0-9]{1,2})(?::([0-9]{1,2}))?$"
+
+
+def _seconds_to_time(seconds: int) -> dtime:
+    return dtime(seconds // 3600, seconds % 3600 // 60, seconds % 60)
+
 
 def parse_time_value(value: Any) -> dtime | None:
-    if value is None:
+    if value is None or value is pd.NaT:
         return None
 
     if isinstance(value, dtime):
@@ -20,6 +31,10 @@ def parse_time_value(value: Any) -> dtime | None:
     if pd.isna(value):
         return None
 
+    if isinstance(value, Real) and not isinstance(value, bool):
+        # Excel stores times as day fractions (and date-times as serial days plus a fraction).
+        return _seconds_to_time(round(float(value) % 1 * SECONDS_PER_DAY) % SECONDS_PER_DAY)
+
     raw = str(value).strip()
     if not raw:
         return None
@@ -38,8 +53,67 @@ def parse_time_value(value: Any) -> dtime | None:
     return parsed_dt.time().replace(microsecond=0) if parsed_dt else None
 
 
+@dataclass(frozen=True, eq=False)
+class ParsedTimes:
+    """``parse_time_value`` applied to a whole column; ``seconds`` is ``-1`` where a cell held no time."""
+
+    seconds: np.ndarray
+    times: np.ndarray
+    labels: np.ndarray
+
+    @property
+    def minutes(self) -> np.ndarray:
+        return np.where(self.seconds >= 0, self.seconds // 60, -1).astype(np.int32)
+
+
+def _value_seconds(value: Any) -> int:
+    parsed = parse_time_value(value)
+    if parsed is None:
+        return -1
+    return parsed.hour * 3600 + parsed.minute * 60 + parsed.second
+
+
+def _unique_seconds(uniques: np.ndarray) -> np.ndarray:
+    seconds = np.full(len(uniques), -1, dtype=np.int32)
+    text_positions: list[int] = []
+    for position, value in enumerate(uniques.tolist()):
+        if isinstance(value, str):
+            text_positions.append(position)
+            continue
+        seconds[position] = _value_seconds(value)
+
+    if text_positions:
+        texts = pd.Series(uniques[text_positions], dtype=object).str.strip()
+        parts = texts.str.extract(CLOCK_PATTERN).apply(pd.to_numeric)
+        hours, minutes, secs = parts[0], parts[1], parts[2].fillna(0)
+        clock = parts[0].notna() & (hours <= 23) & (minutes <= 59) & (secs <= 59)
+        text_seconds = (hours * 3600 + minutes * 60 + secs).where(clock, -1).astype(np.int32)
+        seconds[text_positions] = text_seconds.to_numpy()
+        # Anything that is not a plain clock time keeps the scalar parser's exact semantics.
+        for position, is_clock in zip(text_positions, clock.tolist()):
+            if not is_clock:
+                seconds[position] = _value_seconds(uniques[position])
+    return seconds
+
+
+def parse_time_series(series: pd.Series) -> ParsedTimes:
+    """Vectorized ``parse_time_value``: each distinct cell value is parsed once, then broadcast.
+
+    Also yields the ``HH:MM`` labels, so callers do not ``strftime`` row by row.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    # Missing cells get code -1, which picks the trailing "no time" slot of each lookup table.
+    table = np.append(_unique_seconds(np.asarray(uniques, dtype=object)), np.int32(-1))
+    times = np.array([_seconds_to_time(int(value)) if value >= 0 else None for value in table.tolist()], dtype=object)
+    labels = np.array(
+        [f"{value // 3600:02d}:{value % 3600 // 60:02d}" if value >= 0 else "" for value in table.tolist()],
+        dtype=object,
+    )
+    return ParsedTimes(seconds=table[codes], times=times[codes], labels=labels[codes])
+
+
 def normalize_time_series(series: pd.Series) -> pd.Series:
-    return series.apply(parse_time_value)
+    return pd.Series(parse_time_series(series).times, index=series.index, dtype=object)
 
 
 def to_minutes(value: dtime) -> int:
@@ -58,6 +132,19 @@ def subject_color_hsl(subject: str) -> str:
     return f"hsl({hue} 74% 44%)"
 
 
+@lru_cache(maxsize=64)
+def _magdalenka_rules(
+    exact_groups: tuple[str, ...],
+    prefixes: tuple[str, ...],
+) -> tuple[frozenset[str], tuple[str, ...]]:
+    exact_set = frozenset(
+        str(item).strip().lower()
+        for item in (exact_groups or ("---", "rok", "wszyscy", "all", "year", "cały rok", "caly rok", "d"))
+    )
+    prefix_values = tuple(str(item).strip().lower() for item in (prefixes or ("11", "wsz")) if str(item).strip())
+    return exact_set, prefix_values
+
+
 def is_magdalenka_group(
     group_value: str,
     *,
@@ -69,22 +156,19 @@ def is_magdalenka_group(
     if not normalized:
         return False
 
-    exact_set = {
-        str(item).strip().lower()
-        for item in (exact_groups or ("---", "rok", "wszyscy", "all", "year", "cały rok", "caly rok", "d"))
-    }
+    exact_set, prefix_values = _magdalenka_rules(tuple(exact_groups or ()), tuple(prefixes or ()))
     if normalized in exact_set:
         return True
 
-    prefix_values = tuple(str(item).strip().lower() for item in (prefixes or ("11", "wsz")) if str(item).strip())
-    for prefix in prefix_values:
-        if normalized.startswith(prefix):
-            return True
-
-    return False
+    return normalized.startswith(prefix_values)
 
 
 def normalize_text(value: Any) -> str:
     if value is None or pd.isna(value):
         return ""
     return str(value).strip()
+
+
+def normalize_text_series(series: pd.Series) -> pd.Series:
+    """Vectorized ``normalize_text`` for a whole column."""
+    return series.astype(object).where(series.notna(), "").astype(str).str.strip()
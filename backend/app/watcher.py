@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from pathlib import Path
+import threading
+from typing import Callable, Iterable
+
+try:
+    import watchfiles
+except ImportError:  # pragma: no cover - exercised only without the optional dependency
+    watchfiles = None
+
+WATCH_DEBOUNCE_MS = 300
+# How soon after start-up the notification backend re-checks for changes it could not have seen.
+STARTUP_CHECK_MS = 1000
+
+
+def file_signature(paths: Iterable[Path]) -> str:
+    """Cheap change detector: size and mtime of every path, or ``missing``."""
+    chunks: list[str] = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            chunks.append(f"{path.name}:missing")
+            continue
+        chunks.append(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}")
+    return "|".join(chunks)
+
+
+class FileWatcher:
+    """Background thread that calls ``on_change`` when any of ``tracked_files()`` changes.
+
+    Uses OS notifications through the optional ``watchfiles`` package and falls back to polling
+    ``file_signature`` every ``poll_interval`` seconds (also when notifications fail at runtime,
+    e.g. on filesystems without inotify support).
+    """
+
+    def __init__(
+        self,
+        *,
+        tracked_files: Callable[[], list[Path]],
+        on_change: Callable[[], None],
+        poll_interval: float,
+        use_notifications: bool = True,
+    ) -> None:
+        self._tracked_files = tracked_files
+        self._on_change = on_change
+        self._poll_interval = poll_interval
+        self._use_notifications = use_notifications and watchfiles is not None
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._baseline = ""
+
+    @property
+    def backend(self) -> str:
+        return "watchfiles" if self._use_notifications else "polling"
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        # Taken before the thread exists: edits made while the OS watch is set up are caught by comparison.
+        self._baseline = file_signature(self._tracked_files())
+        self._thread = threading.Thread(target=self._run, name="schedule-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=5)
+        self._thread = None
+
+    def _run(self) -> None:
+        if self._use_notifications:
+            try:
+                self._watch_notifications()
+            except Exception:
+                self._use_notifications = False
+        self._poll()
+
+    def _watch_notifications(self) -> None:
+        directories = sorted({path.parent for path in self._tracked_files() if path.parent.is_dir()})
+        if not directories:
+            raise FileNotFoundError("No watched directory exists.")
+
+        def is_tracked(_change: object, raw_path: str) -> bool:
+            # Evaluated per event: the tracked names follow runtime settings changes.
+            return Path(raw_path) in set(self._tracked_files())
+
+        baseline: str | None = self._baseline
+        for changes in watchfiles.watch(
+            *directories,
+            watch_filter=is_tracked,
+            debounce=WATCH_DEBOUNCE_MS,
+            stop_event=self._stopped,
+            rust_timeout=STARTUP_CHECK_MS,
+            yield_on_timeout=True,
+            recursive=False,
+            raise_interrupt=False,
+        ):
+            # The watch is live by now; anything that changed before it was armed shows up here.
+            missed = baseline is not None and file_signature(self._tracked_files()) != baseline
+            baseline = None
+            if changes or missed:
+                self._on_change()
+
+    def _poll(self) -> None:
+        signature = self._baseline
+        while not self._stopped.wait(self._poll_interval):
+            current = file_signature(self._tracked_files())
+            if current != signature:
+                signature = current
+                self._on_change()
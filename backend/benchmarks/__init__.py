@@ -0,0 +1 @@
+"""Micro-benchmarks for the Plan Zajec API. Run from ``backend/`` with ``python -m benchmarks.<name>``."""
@@ -0,0 +1,106 @@
+"""Throughput of the async read endpoints with 500 concurrent clients while the dataset reloads.
+
+Clients talk to the ASGI app in-process (no sockets), so the numbers isolate the app itself.
+Reloads re-parse the Excel sources on the service's I/O executor, as an upload would.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+import statistics
+import threading
+import time
+
+import httpx
+
+from app.data_loader import load_combined_data
+from app.main import _create_service, create_app
+from app.service import ScheduleService, week_start_for
+from app.snapshot import build_snapshot
+
+CLIENTS = 500
+REQUESTS_PER_CLIENT = 20
+GROUPS = ["", "&group=11a", "&group=12", "&only_magdalenka=true"]
+
+
+def full_reload(service: ScheduleService) -> None:
+    """Re-parse the sources from Excel and publish the result, holding the service lock like a reload does."""
+    with service._lock:
+        current = service._ensure_loaded()
+        frame = load_combined_data(
+            service.settings.data_dir,
+            main_file_name=current.runtime.main_file,
+            practical_file_name=current.runtime.practical_file,
+        )
+        snapshot = build_snapshot(
+            frame,
+            runtime=current.runtime,
+            content_hash=f"{current.content_hash}-{time.monotonic_ns()}",
+            loaded_at=datetime.now(timezone.utc),
+        )
+        service._publish_locked(snapshot)
+
+
+async def client_loop(client: httpx.AsyncClient, index: int, weeks: list[str], latencies: list[float]) -> None:
+    for request_number in range(REQUESTS_PER_CLIENT):
+        anchor = weeks[(index + request_number) % len(weeks)]
+        path = f"/api/v1/schedule/week?anchor_date={anchor}{GROUPS[index % len(GROUPS)]}"
+        started = time.perf_counter()
+        response = await client.get(path)
+        latencies.append(time.perf_counter() - started)
+        response.raise_for_status()
+
+
+async def run(service: ScheduleService, *, reload: bool) -> None:
+    # Uses the app's own service singleton: dependency overrides are re-analysed per request.
+    app = create_app()
+    first_day = service.snapshot().frame["date"].min().date()
+    weeks = [(week_start_for(first_day) + timedelta(weeks=offset)).isoformat() for offset in range(8)]
+
+    reloads = 0
+    stop = threading.Event()
+
+    def reload_loop() -> None:
+        nonlocal reloads
+        while not stop.is_set():
+            full_reload(service)
+            reloads += 1
+
+    latencies: list[float] = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        reloader = asyncio.ensure_future(service.run_io(reload_loop)) if reload else None
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client, index, weeks, latencies) for index in range(CLIENTS)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        if reloader is not None:
+            await reloader
+
+    latencies.sort()
+    label = "during reloads" if reload else "steady state"
+    print(
+        f"{label:<16} {len(latencies) / elapsed:>9,.0f} req/s"
+        f"  p50 {statistics.median(latencies) * 1000:>7.1f} ms"
+        f"  p99 {latencies[int(len(latencies) * 0.99)] * 1000:>7.1f} ms"
+        f"  reloads {reloads}"
+    )
+
+
+def main() -> None:
+    service = _create_service()
+    try:
+        service.health()
+        print(f"{CLIENTS} clients x {REQUESTS_PER_CLIENT} week requests, dataset {service.snapshot().records} rows")
+        started = time.perf_counter()
+        full_reload(service)
+        print(f"one full reload: {(time.perf_counter() - started) * 1000:,.0f} ms")
+        asyncio.run(run(service, reload=False))
+        asyncio.run(run(service, reload=True))
+    finally:
+        service.stop()
+
+
+if __name__ == "__main__":
+    main()
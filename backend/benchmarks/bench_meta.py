@@ -0,0 +1,22 @@
+"""Compare building /api/v1/meta from the frame with the per-version memoized bytes."""
+
+from __future__ import annotations
+
+from .common import loaded_service, measure
+
+
+def main() -> None:
+    with loaded_service() as service:
+        snapshot = service._ensure_loaded()
+        print(f"dataset: {snapshot.records} rows, version {snapshot.version}")
+
+        uncached = measure(
+            "rebuild + serialize on every call",
+            lambda: service._build_meta(snapshot.frame).model_dump_json().encode("utf-8"),
+        )
+        cached = measure("memoized bytes (meta_json)", service.meta_json, repeat=20_000)
+        print(f"speedup: {uncached / cached:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
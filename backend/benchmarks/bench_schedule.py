@@ -0,0 +1,34 @@
+"""Compare week serialization through Pydantic models with the pre-encoded fragment path."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from app.filters import build_filters
+from app.service import week_start_for
+
+from .common import loaded_service, measure
+
+
+def main() -> None:
+    with loaded_service() as service:
+        snapshot = service._ensure_loaded()
+        filters = build_filters()
+        week_start = week_start_for(snapshot.frame["date"].min().date()) + timedelta(days=14)
+        print(f"dataset: {snapshot.records} rows, week of {week_start}")
+
+        model_body = service.get_week_schedule(week_start, filters).model_dump_json().encode("utf-8")
+        fast_body = service._week_bytes(snapshot, week_start, filters)
+        assert fast_body == model_body, "fast path diverged from model serialization"
+        print(f"payload: {len(fast_body):,} bytes")
+
+        model = measure(
+            "models + model_dump_json",
+            lambda: service.get_week_schedule(week_start, filters).model_dump_json().encode("utf-8"),
+        )
+        fast = measure("pre-encoded fragments", lambda: service._week_bytes(snapshot, week_start, filters))
+        print(f"speedup: {model / fast:,.1f}x")
+
+
+if __name__ == "__main__":
+    main()
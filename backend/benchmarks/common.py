@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+import time
+from typing import Callable, Iterator
+
+from app.config import Settings, get_settings
+from app.service import ScheduleService
+
+
+@contextmanager
+def loaded_service(settings: Settings | None = None) -> Iterator[ScheduleService]:
+    service = ScheduleService(settings or get_settings())
+    try:
+        service.health()
+        yield service
+    finally:
+        service.stop()
+
+
+def measure(label: str, func: Callable[[], object], *, repeat: int = 200) -> float:
+    func()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    per_call_us = (time.perf_counter() - started) / repeat * 1_000_000
+    print(f"{label:<44} {per_call_us:>12.1f} us/call")
+    return per_call_us
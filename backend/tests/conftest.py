@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from datetime import datetime, time as dtime
+import json
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+import pytest
+
+from app.config import Settings
+from app.service import ScheduleService
+
+MAIN_FILE = "plan_test.xlsx"
+PRACTICAL_FILE = "praktyki_test.xlsx"
+
+MAIN_HEADER = [
+    "data",
+    "dzien tygodnia",
+    "od",
+    "do",
+    "przedmiot",
+    "rodzaj zajec",
+    "stopien naukowy",
+    "imie",
+    "nazwisko",
+    "sala",
+    "kierunek",
+    "grupa",
+    "info",
+    "dodatkowe informacje",
+]
+
+MAIN_ROWS = [
+    [datetime(2026, 3, 2), "poniedzialek", dtime(8, 0), dtime(9, 30), "Anatomia", "WYK", "dr", "Anna", "Nowak", "101", "PI", "cały rok", None, None],
+    [datetime(2026, 3, 2), "poniedzialek", dtime(9, 0), dtime(10, 30), "Biologia", "LAB", "mgr", "Jan", "Kowalski", "202", "PI", "12", None, None],
+    [datetime(2026, 3, 3), "wtorek", dtime(10, 0), dtime(11, 30), "Anatomia", "CW", "dr", "Anna", "Nowak", "303", "PI", "11a", None, None],
+    [datetime(2026, 3, 10), "wtorek", dtime(12, 0), dtime(13, 0), "Chemia", "WYK", "prof.", "Ewa", "Zielinska", "MsTeams", "PI", "cały rok", None, None],
+]
+
+PRACTICAL_ROWS = {
+    "date": [datetime(2026, 3, 4), datetime(2026, 3, 11)],
+    "start_time": ["07:00", "07:00"],
+    "end_time": ["14:30", "14:30"],
+    "przedmiot": ["Podstawowa opieka zdrowotna", "Podstawowa opieka zdrowotna"],
+    "prowadzacy": ["Prowadzacy Test", "Prowadzacy Test"],
+    "miejsce": ["Przychodnia", "Przychodnia"],
+    "group": ["1a", "11b"],
+    "oddzial": ["POZ", "POZ"],
+    "typ": ["ZP", "ZP"],
+}
+
+
+def write_main_file(path: Path, rows: list[list[object]] | None = None) -> None:
+    frame = pd.DataFrame(rows if rows is not None else MAIN_ROWS, columns=MAIN_HEADER)
+    frame.to_excel(path, startrow=3, index=False)
+
+
+def write_practical_file(path: Path) -> None:
+    pd.DataFrame(PRACTICAL_ROWS).to_excel(path, index=False)
+
+
+@pytest.fixture
+def settings(tmp_path: Path) -> Settings:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    write_main_file(data_dir / MAIN_FILE)
+    write_practical_file(data_dir / PRACTICAL_FILE)
+
+    runtime_settings_file = data_dir / "runtime_settings.json"
+    runtime_settings_file.write_text(
+        json.dumps({"main_file": MAIN_FILE, "practical_file": PRACTICAL_FILE}),
+        encoding="utf-8",
+    )
+
+    return Settings(
+        data_dir=data_dir,
+        cache_ttl_seconds=60,
+        timezone="Europe/Warsaw",
+        allowed_origins=["http://localhost:5173"],
+        settings_password="secret",
+        runtime_settings_file=runtime_settings_file,
+        compiled_cache_dir=data_dir / ".compiled",
+        response_cache_max_bytes=1024 * 1024,
+        response_cache_ttl_seconds=600,
+        sse_max_subscribers=4,
+        sse_heartbeat_seconds=15,
+        compression_min_bytes=256,
+        version_history_size=4,
+        io_workers=2,
+        watch_poll_seconds=1,
+    )
+
+
+@pytest.fixture
+def service(settings: Settings) -> Iterator[ScheduleService]:
+    instance = ScheduleService(settings)
+    yield instance
+    instance.stop()
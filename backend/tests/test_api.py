@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Iterator
+
+from fastapi.testclient import TestClient
+import pytest
+
+from app.config import Settings
+from app.main import EVENTS_STREAM_PATH, CompressionMiddleware, create_app, get_service
+from app.service import ScheduleService
+
+from conftest import MAIN_FILE
+
+
+@pytest.fixture
+def client(service: ScheduleService) -> Iterator[TestClient]:
+    app = create_app()
+    app.dependency_overrides[get_service] = lambda: service
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/api/v1/meta",
+        "/api/v1/settings",
+        "/api/v1/schedule/day?date=2026-03-02&group=12",
+        "/api/v1/schedule/week?anchor_date=2026-03-04&only_magdalenka=true",
+    ],
+)
+def test_conditional_get_returns_not_modified(client: TestClient, path: str) -> None:
+    first = client.get(path)
+    etag = first.headers["etag"]
+
+    second = client.get(path, headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+
+
+def test_week_etag_tracks_week_and_filters(client: TestClient) -> None:
+    monday = client.get("/api/v1/schedule/week?anchor_date=2026-03-02").headers["etag"]
+    sunday = client.get("/api/v1/schedule/week?anchor_date=2026-03-08").headers["etag"]
+    filtered = client.get("/api/v1/schedule/week?anchor_date=2026-03-02&group=12").headers["etag"]
+
+    compact = client.get("/api/v1/schedule/week?anchor_date=2026-03-02&format=compact")
+
+    assert monday == sunday
+    assert filtered != monday
+    assert compact.json()["format"] == "compact"
+    assert compact.headers["etag"] != monday
+    assert client.get("/api/v1/schedule/week?anchor_date=2026-03-09", headers={"If-None-Match": monday}).status_code == 200
+
+
+def test_settings_change_invalidates_etags(client: TestClient) -> None:
+    meta_etag = client.get("/api/v1/meta").headers["etag"]
+    settings_etag = client.get("/api/v1/settings").headers["etag"]
+
+    response = client.put(
+        "/api/v1/settings",
+        json={"magdalenka_prefixes": ["12"]},
+        headers={"x-settings-password": "secret"},
+    )
+    assert response.status_code == 200
+
+    assert client.get("/api/v1/meta", headers={"If-None-Match": meta_etag}).status_code == 200
+    assert client.get("/api/v1/settings", headers={"If-None-Match": settings_etag}).status_code == 200
+
+
+def test_schedule_responses_are_precompressed(client: TestClient, service: ScheduleService) -> None:
+    path = "/api/v1/schedule/week?anchor_date=2026-03-02"
+    identity = client.get(path, headers={"Accept-Encoding": "identity"})
+    first = client.get(path, headers={"Accept-Encoding": "gzip"})
+    hits = service.response_cache_stats().hits
+    second = client.get(path, headers={"Accept-Encoding": "gzip"})
+
+    assert identity.headers.get("content-encoding") is None
+    assert first.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in first.headers["vary"]
+    assert first.headers["etag"] == identity.headers["etag"][:-1] + '-gzip"'
+    revalidated = client.get(path, headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == first.headers["etag"]
+    assert first.content == identity.content
+    assert second.content == identity.content
+    assert service.response_cache_stats().hits == hits + 1
+    assert service.compressor.stats().hits == 1
+
+
+def test_vary_lists_accept_encoding_once(client: TestClient) -> None:
+    week = "/api/v1/schedule/week?anchor_date=2026-03-02"
+    streamed = "/api/v1/schedule/range?from=2026-03-02&to=2026-03-11"
+    etag = client.get(week).headers["etag"]
+    responses = [
+        client.get(week, headers={"Accept-Encoding": "identity"}),
+        client.get(week, headers={"Accept-Encoding": "gzip"}),
+        client.get(week, headers={"Accept-Encoding": "gzip", "If-None-Match": etag}),
+        client.get(streamed, headers={"Accept-Encoding": "identity"}),
+        client.get(streamed, headers={"Accept-Encoding": "gzip"}),
+    ]
+
+    for response in responses:
+        tokens = [token.strip().lower() for value in response.headers.get_list("vary") for token in value.split(",")]
+        assert tokens.count("accept-encoding") == 1
+
+
+def test_range_endpoint_streams_days_and_validates_bounds(client: TestClient) -> None:
+    response = client.get("/api/v1/schedule/range?from=2026-03-02&to=2026-03-11&group=12")
+
+    assert response.status_code == 200
+    assert [day["date"] for day in response.json()["days"]][-1] == "2026-03-11"
+    assert client.get(
+        "/api/v1/schedule/range?from=2026-03-02&to=2026-03-11&group=12",
+        headers={"If-None-Match": response.headers["etag"]},
+    ).status_code == 304
+    assert client.get("/api/v1/schedule/range?from=2026-03-11&to=2026-03-02").status_code == 422
+    assert client.get("/api/v1/schedule/range?from=2026-01-01&to=2026-12-31").status_code == 422
+
+
+def test_calendar_feed_is_streamed_then_served_from_cache(client: TestClient, service: ScheduleService) -> None:
+    path = "/api/v1/calendar.ics?group=12"
+    first = client.get(path)
+    hits = service.response_cache_stats().hits
+    second = client.get(path)
+
+    assert first.status_code == 200
+    assert first.headers["content-type"].startswith("text/calendar")
+    assert first.text.startswith("BEGIN:VCALENDAR\r\n")
+    assert first.text.endswith("END:VCALENDAR\r\n")
+    assert first.text.count("BEGIN:VEVENT") == 1
+    assert second.content == first.content
+    assert service.response_cache_stats().hits > hits
+
+    conditional = {"If-Modified-Since": first.headers["last-modified"]}
+    assert client.get(path, headers=conditional).status_code == 304
+    assert client.get(path, headers={"If-None-Match": first.headers["etag"]}).status_code == 304
+    assert client.get("/api/v1/calendar.ics").headers["etag"] != first.headers["etag"]
+
+
+def test_changes_endpoint_requires_a_known_version(client: TestClient, service: ScheduleService) -> None:
+    version = service.snapshot().version
+
+    response = client.get(f"/api/v1/schedule/changes?since={version}&group=12")
+
+    assert response.status_code == 200
+    assert response.json() == {"since": version, "version": version, "added": [], "removed": [], "modified": []}
+    assert client.get("/api/v1/schedule/changes?since=0000").status_code == 410
+
+
+def test_reads_are_served_while_a_reload_holds_the_lock(client: TestClient, service: ScheduleService) -> None:
+    assert client.get("/api/v1/meta").status_code == 200
+
+    with service._lock:
+        assert client.get("/api/v1/schedule/week?anchor_date=2026-03-02").status_code == 200
+        assert client.get("/api/v1/health").json()["records"] == 6
+
+
+def test_lifespan_warms_up_before_serving(client: TestClient, service: ScheduleService) -> None:
+    assert service._snapshot is not None
+    assert service._refresher is not None
+
+    ready = client.get("/readyz")
+
+    assert client.get("/livez").json() == {"status": "ok"}
+    assert ready.status_code == 200
+    assert ready.json()["version"] == service.snapshot().version
+    assert ready.json()["records"] == 6
+    assert ready.json()["load_duration_ms"] > 0
+
+
+def test_readyz_fails_without_data_but_livez_passes(service: ScheduleService, settings: Settings) -> None:
+    (settings.data_dir / MAIN_FILE).unlink()
+    app = create_app()
+    app.dependency_overrides[get_service] = lambda: service
+
+    with TestClient(app) as test_client:
+        assert test_client.get("/livez").status_code == 200
+        assert test_client.get("/readyz").status_code == 503
+        assert test_client.get("/readyz").json()["status"] == "loading"
+
+
+def test_event_stream_does_not_leak_subscribers_on_early_disconnect(service: ScheduleService) -> None:
+    app = create_app()
+    endpoint = next(route.endpoint for route in app.routes if getattr(route, "path", None) == "/api/v1/events/stream")
+
+    async def abandoned_responses() -> None:
+        # A client that drops before the first chunk leaves the body iterator unstarted.
+        for _ in range(service.settings.sse_max_subscribers + 2):
+            response = await endpoint(service=service)
+            assert response.status_code == 200
+        assert service.change_feed.subscriber_count == 0
+
+        response = await endpoint(service=service)
+        first = await response.body_iterator.__anext__()
+        assert first.startswith(b"event: dataset")
+        assert service.change_feed.subscriber_count == 1
+        await response.body_iterator.aclose()
+
+    asyncio.run(abandoned_responses())
+
+    assert service.change_feed.subscriber_count == 0
+
+
+def test_compression_middleware_leaves_event_stream_alone() -> None:
+    async def inner(scope: dict[str, object], receive: object, send: Callable[[dict[str, object]], Awaitable[None]]) -> None:
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+        await send({"type": "http.response.body", "body": b": heartbeat\n\n" * 100, "more_body": False})
+
+    middleware = CompressionMiddleware(inner, minimum_size=16)
+
+    def call(path: str) -> dict[bytes, bytes]:
+        sent: list[dict[str, object]] = []
+
+        async def receive() -> dict[str, object]:
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message: dict[str, object]) -> None:
+            sent.append(message)
+
+        scope = {"type": "http", "path": path, "method": "GET", "headers": [(b"accept-encoding", b"gzip")]}
+        asyncio.run(middleware(scope, receive, send))
+        return dict(sent[0]["headers"])
+
+    assert b"content-encoding" not in call(EVENTS_STREAM_PATH)
+    assert call("/api/v1/settings")[b"content-encoding"] == b"gzip"
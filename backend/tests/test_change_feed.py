@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from app.change_feed import ChangeFeed, format_sse
+from app.service import ScheduleService
+
+
+def test_format_sse_frames_event() -> None:
+    assert format_sse("dataset", {"version": "abc"}, event_id="abc") == (
+        b'event: dataset\nid: abc\ndata: {"version":"abc"}\n\n'
+    )
+
+
+def test_change_feed_delivers_across_threads_and_bounds_fan_out() -> None:
+    feed = ChangeFeed(max_subscribers=1)
+
+    async def scenario() -> dict[str, str]:
+        queue = feed.subscribe()
+        assert queue is not None
+        assert feed.subscribe() is None
+
+        publisher = threading.Thread(target=feed.publish, args=({"version": "v2"},))
+        publisher.start()
+        publisher.join()
+        message = await asyncio.wait_for(queue.get(), timeout=1)
+
+        feed.unsubscribe(queue)
+        assert feed.subscriber_count == 0
+        return message
+
+    assert asyncio.run(scenario()) == {"version": "v2"}
+
+
+def test_slow_subscriber_keeps_latest_messages() -> None:
+    feed = ChangeFeed(max_subscribers=1)
+
+    async def scenario() -> list[int]:
+        queue = feed.subscribe()
+        assert queue is not None
+        for number in range(20):
+            feed.publish({"n": number})
+        await asyncio.sleep(0)
+        return [queue.get_nowait()["n"] for _ in range(queue.qsize())]
+
+    received = asyncio.run(scenario())
+    assert received[-1] == 19
+    assert len(received) < 20
+
+
+def test_new_snapshot_is_pushed_to_subscribers(service: ScheduleService) -> None:
+    service.snapshot()
+
+    async def scenario() -> dict[str, str]:
+        queue = service.change_feed.subscribe()
+        assert queue is not None
+        await asyncio.to_thread(service.update_runtime_settings, magdalenka_prefixes=["12"])
+        return await asyncio.wait_for(queue.get(), timeout=1)
+
+    message = asyncio.run(scenario())
+    assert message["version"] == service.snapshot().version
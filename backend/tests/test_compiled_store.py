@@ -0,0 +1,86 @@
+from datetime import time as dtime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.compiled_store import CompiledDataset, CompiledStore, source_content_hash
+from app.data_loader import OUTPUT_COLUMNS
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2026-03-02", "2026-03-03"]),
+            "start_time": ["08:00", ""],
+            "end_time": ["09:30", ""],
+            "start_time_obj": [dtime(8, 0), None],
+            "end_time_obj": [dtime(9, 30, 15), None],
+            "subject": ["Anatomia", "Zajęcia praktyczne"],
+            "instructor": ["dr A", ""],
+            "room": ["101", "Przychodnia"],
+            "group": ["cały rok", "1a"],
+            "oddzial": ["", "POZ"],
+            "type": ["WYK", "ZP"],
+            "source": ["main", "praktyki"],
+        },
+        columns=OUTPUT_COLUMNS,
+    )
+
+
+def test_compiled_store_round_trip(tmp_path: Path) -> None:
+    store = CompiledStore(tmp_path / "compiled")
+    frame = _frame()
+
+    assert store.load("abc") is None
+    assert store.store("abc", frame) is True
+
+    loaded = store.load("abc")
+    assert loaded is not None
+    assert loaded.frame.equals(frame)
+    assert loaded.frame.dtypes.equals(frame.dtypes)
+
+
+def test_compiled_indexes_are_mapped_read_only(tmp_path: Path) -> None:
+    store = CompiledStore(tmp_path / "compiled")
+    frame = _frame().iloc[::-1]
+    store.store("abc", frame)
+
+    loaded = store.load("abc")
+    built = CompiledDataset.build(frame)
+
+    assert loaded is not None
+    assert loaded.frame.equals(built.frame)
+    for name in ("row_days", "start_min", "end_min"):
+        mapped = getattr(loaded.columns, name)
+        assert isinstance(mapped, np.memmap) and not mapped.flags.writeable
+        assert np.array_equal(mapped, getattr(built.columns, name))
+    assert loaded.columns.postings.keys() == built.columns.postings.keys()
+    for column, postings in loaded.columns.postings.items():
+        assert postings.keys() == built.columns.postings[column].keys()
+        for value, posting in postings.items():
+            assert isinstance(posting, np.memmap) and not posting.flags.writeable
+            assert np.array_equal(posting, built.columns.postings[column][value])
+
+
+def test_source_content_hash_tracks_file_content(tmp_path: Path) -> None:
+    source = tmp_path / "plan.xlsx"
+    source.write_bytes(b"first")
+    first = source_content_hash([source])
+
+    source.write_bytes(b"first")
+    assert source_content_hash([source]) == first
+
+    source.write_bytes(b"second")
+    assert source_content_hash([source]) != first
+
+
+def test_pointer_file_is_replaced_atomically(tmp_path: Path) -> None:
+    store = CompiledStore(tmp_path / "compiled")
+    assert store.current() is None
+
+    store.publish("abc")
+    store.publish("def")
+
+    assert store.current() == "def"
+    assert [path.name for path in (tmp_path / "compiled").iterdir()] == ["CURRENT"]
@@ -0,0 +1,29 @@
+import gzip
+
+from app.compression import ResponseCompressor, negotiate_encoding
+from app.response_cache import ResponseCache
+
+
+def test_negotiate_encoding_honours_quality_values() -> None:
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("GZIP;q=0.5") == "gzip"
+    assert negotiate_encoding("gzip;q=0") is None
+    assert negotiate_encoding("*") is not None
+    assert negotiate_encoding("*, gzip;q=0") in (None, "br")
+
+
+def test_compressor_reuses_encoded_bodies_above_threshold() -> None:
+    cache = ResponseCache(max_bytes=100_000, ttl_seconds=60)
+    compressor = ResponseCompressor(cache, min_bytes=100)
+    body = b'{"events":[' + b'{"subject":"Anatomia"},' * 50 + b"{}]}"
+
+    encoded, encoding = compressor.encode(body, "gzip", cache_key='"etag"')
+    again, _ = compressor.encode(body, "gzip", cache_key='"etag"')
+
+    assert encoding == "gzip"
+    assert gzip.decompress(encoded) == body
+    assert again is encoded
+    assert compressor.encode(b"{}", "gzip", cache_key='"small"') == (b"{}", None)
+    assert compressor.encode(body, None, cache_key='"etag"') == (body, None)
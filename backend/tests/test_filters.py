@@ -1,6 +1,7 @@
+import numpy as np
 import pandas as pd
 
-from app.filters import apply_filters, apply_filters_with_magdalenka, build_filters
+from app.filters import FilterIndex, apply_filters, apply_filters_with_magdalenka, build_filters
 
 
 def _fixture() -> pd.DataFrame:
@@ -56,3 +57,23 @@ def test_only_magdalenka_uses_runtime_configuration() -> None:
     )
 
     assert "x1" in result["group"].tolist()
+
+
+def test_filter_index_matches_frame_filters() -> None:
+    frame = _fixture()
+    index = FilterIndex.build(frame)
+    cases = [
+        build_filters(),
+        build_filters(subject=["anatomia"], room=["101", "303"]),
+        build_filters(group=["11", "3"], type=["PRAKTYKI"]),
+        build_filters(instructor=["missing"]),
+        build_filters(only_magdalenka=True),
+        build_filters(subject=["Anatomia", "Biologia"], only_magdalenka=True),
+    ]
+
+    for filters in cases:
+        expected = apply_filters(frame, filters).index.tolist()
+        assert np.flatnonzero(index.mask(filters)).tolist() == expected
+
+    window = index.mask(build_filters(subject=["Anatomia"]), start=1, stop=3)
+    assert window.tolist() == [False, True]
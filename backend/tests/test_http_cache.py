@@ -0,0 +1,23 @@
+import pytest
+
+from app import http_cache
+from app.http_cache import encoded_etag, etag_matches, make_etag, matching_etag
+
+
+def test_etags_change_with_the_application_code(monkeypatch: pytest.MonkeyPatch) -> None:
+    before = make_etag("v1", "week")
+
+    monkeypatch.setattr(http_cache, "_code_fingerprint", lambda: "other-build")
+
+    assert make_etag("v1", "week") != before
+
+
+def test_encoded_variants_match_their_identity_tag() -> None:
+    etag = make_etag("v1", "meta")
+    gzip_etag = encoded_etag(etag, "gzip")
+
+    assert gzip_etag != etag
+    assert etag_matches(f'W/{gzip_etag}, "other"', etag)
+    assert matching_etag(f'"other", {gzip_etag}', etag) == gzip_etag
+    assert matching_etag('"other"', etag) is None
+    assert encoded_etag(etag, None) == etag
@@ -0,0 +1,40 @@
+from zoneinfo import ZoneInfo
+
+from app.icalendar import MAX_LINE_OCTETS, escape_text, fold_line, vevent
+
+
+def test_fold_line_keeps_utf8_sequences_intact() -> None:
+    line = "SUMMARY:" + "ąść" * 40
+
+    folded = fold_line(line)
+    parts = folded[:-2].split(b"\r\n ")
+
+    assert all(len(part) <= MAX_LINE_OCTETS for part in parts)
+    assert b"".join(parts).decode("utf-8") == line
+    assert fold_line("VERSION:2.0") == b"VERSION:2.0\r\n"
+
+
+def test_vevent_uses_event_id_and_utc_times() -> None:
+    record = {
+        "id": "abc123",
+        "date": "2026-03-30",
+        "start_min": 8 * 60,
+        "end_min": 9 * 60 + 30,
+        "subject": "Anatomia; wyklad",
+        "instructor": "dr Anna Nowak",
+        "room": "101, A",
+        "group": "cały rok",
+        "oddzial": "",
+        "type": "WYK",
+        "source": "main",
+    }
+
+    body = vevent(record, zone=ZoneInfo("Europe/Warsaw"), stamp="20260301T000000Z").decode("utf-8")
+
+    assert "UID:abc123@plan-zajec\r\n" in body
+    assert "DTSTART:20260330T060000Z\r\n" in body
+    assert "DTEND:20260330T073000Z\r\n" in body
+    assert "SUMMARY:Anatomia\\; wyklad (WYK)\r\n" in body
+    assert "LOCATION:101\\, A\r\n" in body
+    assert "Oddzial" not in body
+    assert escape_text("a\\b\nc") == "a\\\\b\\nc"
@@ -0,0 +1,38 @@
+from app.response_cache import ENTRY_OVERHEAD_BYTES, ResponseCache
+
+
+def test_response_cache_counts_hits_and_misses() -> None:
+    cache = ResponseCache(max_bytes=10_000, ttl_seconds=60)
+
+    assert cache.get("week") is None
+    cache.put("week", b"{}")
+    assert cache.get("week") == b"{}"
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+    assert stats.size_bytes == 2 + ENTRY_OVERHEAD_BYTES
+
+
+def test_response_cache_evicts_least_recently_used_by_size() -> None:
+    body = b"x" * 100
+    cache = ResponseCache(max_bytes=2 * (len(body) + ENTRY_OVERHEAD_BYTES), ttl_seconds=60)
+
+    cache.put("a", body)
+    cache.put("b", body)
+    cache.get("a")
+    cache.put("c", body)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == body
+    assert cache.get("c") == body
+    assert cache.stats().evictions == 1
+
+
+def test_response_cache_clear_drops_entries() -> None:
+    cache = ResponseCache(max_bytes=10_000, ttl_seconds=60)
+    cache.put("a", b"1")
+
+    cache.clear()
+
+    assert cache.get("a") is None
+    assert cache.stats().size_bytes == 0
@@ -1,5 +1,8 @@
+import json
 from pathlib import Path
 
+import pytest
+
 from app.runtime_settings import RuntimeSettingsStore
 
 
@@ -25,3 +28,72 @@ def test_runtime_settings_store_persists_values(tmp_path: Path) -> None:
     assert loaded.main_file == "plan_zajec.xlsx"
     assert loaded.practical_file == "praktyki_tidy (1).xlsx"
     assert tuple(updated.magdalenka_exact_groups) == tuple(loaded.magdalenka_exact_groups)
+
+
+def _store(tmp_path: Path) -> RuntimeSettingsStore:
+    data_dir = tmp_path / "data"
+    data_dir.mkdir(exist_ok=True)
+    return RuntimeSettingsStore(data_dir=data_dir, settings_file=data_dir / "runtime_settings.json")
+
+
+def test_runtime_settings_are_served_from_memory(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    store = _store(tmp_path)
+    saved = store.update(main_file="plan_zajec.xlsx")
+
+    def fail() -> None:
+        raise AssertionError("settings file read again")
+
+    monkeypatch.setattr(store, "_read_file", fail)
+    assert store.load() is saved
+    assert store.refresh() is saved
+
+
+def test_runtime_settings_refresh_picks_up_external_edits(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    saved = store.update(main_file="plan_zajec.xlsx", magdalenka_prefixes=["11"])
+    settings_file = tmp_path / "data" / "runtime_settings.json"
+
+    payload = json.loads(settings_file.read_text(encoding="utf-8"))
+    payload["magdalenka_prefixes"] = ["12", "13"]
+    settings_file.write_text(json.dumps(payload), encoding="utf-8")
+    assert store.load() == saved
+
+    assert store.refresh().magdalenka_prefixes == ("12", "13")
+    assert store.load().magdalenka_prefixes == ("12", "13")
+
+
+def test_runtime_settings_save_replaces_file_atomically(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    store.update(main_file="plan_zajec.xlsx")
+    store.update(practical_file="praktyki_tidy.xlsx")
+
+    assert [path.name for path in (tmp_path / "data").iterdir()] == ["runtime_settings.json"]
+    reread = _store(tmp_path).load()
+    assert (reread.main_file, reread.practical_file) == ("plan_zajec.xlsx", "praktyki_tidy.xlsx")
+
+
+
+def test_runtime_settings_update_keeps_edits_saved_by_another_worker(tmp_path: Path) -> None:
+    first = _store(tmp_path)
+    second = _store(tmp_path)
+    first.update(main_file="plan_zajec.xlsx", magdalenka_prefixes=["11", "wsz"])
+    assert second.load().magdalenka_prefixes == ("11", "wsz")
+
+    first.update(magdalenka_prefixes=["12"])
+    updated = second.update(practical_file="praktyki_tidy.xlsx")
+
+    assert updated.magdalenka_prefixes == ("12",)
+    assert _store(tmp_path).load() == updated
+
+
+def test_runtime_settings_update_writes_nothing_when_validation_fails(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    saved = store.update(main_file="plan_zajec.xlsx")
+
+    def reject(data: object) -> None:
+        raise ValueError("brak pliku")
+
+    with pytest.raises(ValueError, match="brak pliku"):
+        store.update(main_file="inny.xlsx", validate=reject)
+
+    assert _store(tmp_path).load() == saved
@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date, timedelta
+import json
+import threading
+
+import numpy as np
+import pytest
+
+from app.config import Settings
+from app.filters import build_filters
+from app.serialization import COMPACT_EVENT_FIELDS, COMPACT_STRING_FIELDS
+from app.service import MAX_RANGE_DAYS, ScheduleService
+
+from conftest import MAIN_FILE, MAIN_ROWS, write_main_file
+
+
+def test_expired_ttl_revalidates_without_reloading(service: ScheduleService, settings: Settings) -> None:
+    first = service.health()
+    assert first.records == 6
+
+    service._last_checked_at = first.last_checked_at - timedelta(seconds=settings.cache_ttl_seconds + 1)
+    (settings.data_dir / MAIN_FILE).touch()
+    service._refresh_once()
+
+    second = service.health()
+    assert second.last_reload_at == first.last_reload_at
+    assert second.last_checked_at > first.last_reload_at
+
+
+def test_changed_source_is_reloaded_in_background(service: ScheduleService, settings: Settings) -> None:
+    first = service.health()
+
+    write_main_file(settings.data_dir / MAIN_FILE, rows=MAIN_ROWS[:2])
+    assert service.health().records == 6
+
+    service._refresh_once()
+    second = service.health()
+    assert second.records == 4
+    assert second.last_reload_at > first.last_reload_at
+
+
+def test_failed_background_check_is_logged_and_reported(
+    service: ScheduleService,
+    settings: Settings,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    first = service.health()
+    (settings.data_dir / MAIN_FILE).write_bytes(b"to nie jest arkusz")
+    service._watch_version += 1
+
+    service._refresh_once()
+
+    failed = service.health()
+    assert "Background revalidation failed" in caplog.text
+    assert failed.status == "degraded"
+    assert failed.last_error
+    assert failed.last_checked_at == first.last_checked_at
+    assert failed.last_failed_at is not None and failed.last_failed_at > first.last_checked_at
+    assert failed.records == first.records
+
+    write_main_file(settings.data_dir / MAIN_FILE, rows=MAIN_ROWS[:2])
+    service._watch_version += 1
+    service._refresh_once()
+
+    recovered = service.health()
+    assert (recovered.status, recovered.last_error, recovered.records) == ("ok", None, 4)
+
+
+def test_settings_update_publishes_new_snapshot(service: ScheduleService) -> None:
+    before = service._ensure_loaded()
+
+    service.update_runtime_settings(magdalenka_prefixes=["12"])
+
+    after = service._ensure_loaded()
+    assert after is not before
+    assert after.version != before.version
+    assert after.runtime.magdalenka_prefixes == ("12",)
+    assert before.runtime.magdalenka_prefixes == ("11", "wsz")
+
+
+def test_magdalenka_rule_change_reuses_indexes(service: ScheduleService) -> None:
+    filters = build_filters(only_magdalenka=True)
+    before = service._ensure_loaded()
+    assert [event.group for event in service.get_day_schedule(date(2026, 3, 3), filters).events] == ["11a"]
+
+    service.update_runtime_settings(magdalenka_prefixes=["12"])
+
+    after = service._ensure_loaded()
+    assert after.filters is before.filters
+    assert after.events is before.events
+    assert service.get_day_schedule(date(2026, 3, 3), filters).events == []
+    assert [event.group for event in service.get_day_schedule(date(2026, 3, 2), filters).events] == ["cały rok", "12"]
+
+
+def test_meta_is_built_when_a_snapshot_is_published(
+    service: ScheduleService,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    service.snapshot()
+    service.update_runtime_settings(magdalenka_prefixes=["12"])
+
+    def fail(*args: object, **kwargs: object) -> None:
+        raise AssertionError("meta built on the request path")
+
+    monkeypatch.setattr(service, "_build_meta", fail)
+    assert json.loads(service.meta_json(service.snapshot()))["timezone"] == "Europe/Warsaw"
+
+
+def test_meta_is_memoized_per_snapshot_version(service: ScheduleService, settings: Settings) -> None:
+    body = service.meta_json()
+    assert service.meta_json() is body
+    assert body == service.meta().model_dump_json().encode("utf-8")
+
+    write_main_file(settings.data_dir / MAIN_FILE, rows=MAIN_ROWS[:2])
+    service._refresh_once()
+
+    assert service.meta_json() is not body
+    assert "Chemia" not in service.meta().filters.subject
+
+
+def test_schedule_json_is_cached_until_next_snapshot(service: ScheduleService) -> None:
+    filters = build_filters(only_magdalenka=True)
+    body = service.week_schedule_json(date(2026, 3, 4), filters)
+
+    assert service.week_schedule_json(date(2026, 3, 2), filters) is body
+    assert body == service.get_week_schedule(date(2026, 3, 4), filters).model_dump_json().encode("utf-8")
+    assert service.response_cache_stats().hits == 1
+
+    service.update_runtime_settings(magdalenka_prefixes=["12"])
+
+    assert service.response_cache_stats().entries == 0
+    assert service.week_schedule_json(date(2026, 3, 2), filters) != body
+
+
+def test_fast_json_matches_model_serialization(service: ScheduleService, settings: Settings) -> None:
+    rows = [list(row) for row in MAIN_ROWS]
+    rows[1][4] = 'Biologia "kliniczna" \\ ąść\t😀'
+    rows[1][9] = "</script> "
+    write_main_file(settings.data_dir / MAIN_FILE, rows)
+    filters = build_filters()
+
+    for day in (date(2026, 3, 2), date(2026, 3, 5)):
+        expected = service.get_day_schedule(day, filters).model_dump_json().encode("utf-8")
+        assert service.day_schedule_json(day, filters) == expected
+    expected = service.get_week_schedule(date(2026, 3, 2), filters).model_dump_json().encode("utf-8")
+    assert service.week_schedule_json(date(2026, 3, 2), filters) == expected
+
+
+def test_compact_week_expands_to_full_week(service: ScheduleService) -> None:
+    filters = build_filters()
+    full = json.loads(service.week_schedule_json(date(2026, 3, 2), filters))
+    compact = json.loads(service.week_schedule_json(date(2026, 3, 2), filters, compact=True))
+
+    assert compact["fields"] == list(COMPACT_EVENT_FIELDS)
+    assert len(compact["strings"]) == len(set(compact["strings"]))
+    strings = compact["strings"]
+    for compact_day, full_day in zip(compact["days"], full["days"], strict=True):
+        assert {**compact_day, "events": None} == {**full_day, "events": None}
+        expanded = []
+        for values in compact_day["events"]:
+            event = dict(zip(compact["fields"], values), date=compact_day["date"])
+            event.update({field: strings[event[field]] for field in COMPACT_STRING_FIELDS})
+            expanded.append(event)
+        assert expanded == full_day["events"]
+
+
+def test_range_json_streams_the_same_days_as_weeks(service: ScheduleService) -> None:
+    filters = build_filters()
+    chunks = list(service.iter_range_json(date(2026, 3, 2), date(2026, 3, 15), filters))
+    payload = json.loads(b"".join(chunks))
+    weeks = [json.loads(service.week_schedule_json(day, filters)) for day in (date(2026, 3, 2), date(2026, 3, 9))]
+
+    assert len(chunks) == 14 + 2
+    assert (payload["date_from"], payload["date_to"]) == ("2026-03-02", "2026-03-15")
+    assert payload["days"] == weeks[0]["days"] + weeks[1]["days"]
+
+
+def test_range_json_rejects_reversed_and_oversized_ranges(service: ScheduleService) -> None:
+    filters = build_filters()
+    with pytest.raises(ValueError):
+        service.iter_range_json(date(2026, 3, 9), date(2026, 3, 2), filters)
+    with pytest.raises(ValueError):
+        service.iter_range_json(date(2026, 3, 1), date(2026, 3, 1) + timedelta(days=MAX_RANGE_DAYS), filters)
+
+
+def test_schedule_changes_diff_against_recent_versions(service: ScheduleService, settings: Settings) -> None:
+    filters = build_filters()
+    before = service.snapshot()
+    rows = [list(row) for row in MAIN_ROWS[:3]]
+    rows[0][5] = "CW"
+    rows.append([date(2026, 3, 12), "czwartek", MAIN_ROWS[0][2], MAIN_ROWS[0][3], "Fizjologia", "WYK", "dr", "Anna", "Nowak", "101", "PI", "12", None, None])
+    write_main_file(settings.data_dir / MAIN_FILE, rows)
+    service._refresh_once()
+    after = service.snapshot()
+
+    changes = json.loads(service.schedule_changes_json(before.version, filters))
+
+    assert (changes["since"], changes["version"]) == (before.version, after.version)
+    assert [event["subject"] for event in changes["added"]] == ["Fizjologia"]
+    assert len(changes["removed"]) == 1
+    assert [(event["subject"], event["type"]) for event in changes["modified"]] == [("Anatomia", "CW")]
+    assert json.loads(service.schedule_changes_json(after.version, filters))["added"] == []
+    assert service.schedule_changes_json("unknown", filters) is None
+
+
+def test_run_io_uses_the_bounded_executor(service: ScheduleService, settings: Settings) -> None:
+    async def run() -> list[str]:
+        return await asyncio.gather(*(service.run_io(lambda: threading.current_thread().name) for _ in range(8)))
+
+    names = asyncio.run(run())
+
+    assert all(name.startswith("schedule-io") for name in names)
+    assert len(set(names)) <= settings.io_workers
+
+
+def test_renders_do_not_queue_behind_busy_io_workers(service: ScheduleService, settings: Settings) -> None:
+    snapshot = service.snapshot()
+    release = threading.Event()
+
+    async def run() -> bytes:
+        # Every I/O thread is stuck, as during an Excel parse after an upload.
+        parses = [asyncio.ensure_future(service.run_io(release.wait)) for _ in range(settings.io_workers)]
+        try:
+            return await asyncio.wait_for(
+                service.week_schedule_json_async(date(2026, 3, 4), build_filters(group=["12"]), snapshot),
+                timeout=5,
+            )
+        finally:
+            release.set()
+            await asyncio.gather(*parses)
+
+    assert json.loads(asyncio.run(run()))["week_start"] == "2026-03-02"
+
+
+def test_identical_concurrent_misses_render_once(service: ScheduleService) -> None:
+    filters = build_filters(group=["12"])
+    snapshot = service.snapshot()
+
+    async def run() -> list[bytes]:
+        return await asyncio.gather(
+            *(service.week_schedule_json_async(date(2026, 3, 4), filters, snapshot) for _ in range(20))
+        )
+
+    bodies = asyncio.run(run())
+
+    assert all(body is bodies[0] for body in bodies)
+    assert bodies[0] == service.week_schedule_json(date(2026, 3, 2), filters)
+    assert service.response_cache_stats().entries == 1
+
+
+def test_second_worker_loads_the_compiled_dataset(
+    service: ScheduleService,
+    settings: Settings,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    first = service.snapshot()
+    assert service._compiled_store.current() == first.content_hash
+
+    def fail(*args: object, **kwargs: object) -> None:
+        raise AssertionError("worker parsed the Excel sources again")
+
+    monkeypatch.setattr("app.service.load_combined_data", fail)
+    worker = ScheduleService(settings)
+    try:
+        assert worker.snapshot().version == first.version
+        assert worker.health().records == first.records
+        postings = worker.snapshot().filters.postings["group"]
+        assert all(isinstance(posting, np.memmap) for posting in postings.values())
+        assert isinstance(worker.snapshot().events.start_min, np.memmap)
+    finally:
+        worker.stop()
+
+
+def test_readiness_never_loads_data(service: ScheduleService) -> None:
+    assert service.readiness().status == "loading"
+    assert service._snapshot is None
+
+    service.warm_up()
+
+    assert service.readiness().status == "ready"
+    assert service._meta_cache is not None
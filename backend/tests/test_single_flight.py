@@ -0,0 +1,85 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+import pytest
+
+from app.single_flight import SingleFlight
+
+
+def test_concurrent_threads_share_one_call() -> None:
+    flights: SingleFlight[int] = SingleFlight()
+    calls = 0
+    barrier = threading.Barrier(8)
+
+    def compute() -> int:
+        nonlocal calls
+        calls += 1
+        time.sleep(0.05)
+        return 42
+
+    def caller() -> int:
+        barrier.wait()
+        return flights.do("week", compute)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: caller(), range(8)))
+
+    assert results == [42] * 8
+    assert calls == 1
+    assert flights.in_flight == 0
+
+
+def test_async_waiters_share_result_and_errors() -> None:
+    flights: SingleFlight[int] = SingleFlight()
+    calls = 0
+
+    def compute() -> int:
+        nonlocal calls
+        calls += 1
+        time.sleep(0.05)
+        return calls
+
+    def fail() -> int:
+        time.sleep(0.05)
+        raise ValueError("boom")
+
+    async def run_in_thread(func) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, func)
+
+    async def scenario() -> None:
+        results = await asyncio.gather(*(flights.do_async("week", compute, run_in_thread) for _ in range(20)))
+        assert results == [1] * 20
+
+        outcomes = await asyncio.gather(
+            *(flights.do_async("broken", fail, run_in_thread) for _ in range(5)),
+            return_exceptions=True,
+        )
+        assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+
+    asyncio.run(scenario())
+    assert calls == 1
+    assert flights.in_flight == 0
+
+
+def test_cancelled_waiter_does_not_cancel_the_flight() -> None:
+    flights: SingleFlight[str] = SingleFlight()
+
+    def compute() -> str:
+        time.sleep(0.05)
+        return "body"
+
+    async def run_in_thread(func) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, func)
+
+    async def scenario() -> str:
+        leader = asyncio.ensure_future(flights.do_async("week", compute, run_in_thread))
+        follower = asyncio.ensure_future(flights.do_async("week", compute, run_in_thread))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(scenario()) == "body"
@@ -0,0 +1,50 @@
+from datetime import date, time as dtime
+
+import pandas as pd
+
+from app.snapshot import DateIndex, EventTable, event_id
+from app.utils import subject_color_hsl
+
+
+def test_date_index_partitions_sorted_rows() -> None:
+    dates = pd.Series(pd.to_datetime(["2026-03-02", "2026-03-02", "2026-03-04", "2026-03-10"]))
+
+    index = DateIndex.build(dates)
+
+    assert index.day(date(2026, 3, 2)) == (0, 2)
+    assert index.day(date(2026, 3, 3)) == (0, 0)
+    assert index.bounds(date(2026, 3, 2), date(2026, 3, 8)) == (0, 3)
+    assert index.bounds(date(2026, 3, 3), date(2026, 3, 9)) == (2, 3)
+    assert index.bounds(date(2026, 4, 1), date(2026, 4, 7)) == (4, 4)
+
+
+def test_event_table_precomputes_request_fields() -> None:
+    frame = pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2026-03-02", "2026-03-02"]),
+            "start_time": ["08:00", "10:00"],
+            "end_time": ["", "09:00"],
+            "start_time_obj": [dtime(8, 0), dtime(10, 0)],
+            "end_time_obj": [dtime(9, 30), dtime(9, 0)],
+            "subject": [" Anatomia ", "Biologia"],
+            "instructor": ["dr A", None],
+            "room": ["101", "202"],
+            "group": ["11", "12"],
+            "oddzial": [None, ""],
+            "type": ["WYK", "LAB"],
+            "source": ["main", "main"],
+        }
+    )
+
+    table = EventTable.build(frame)
+
+    record = table.records[0]
+    assert record is not None
+    assert record["subject"] == "Anatomia"
+    assert record["oddzial"] == ""
+    assert record["end_time"] == "09:30"
+    assert (record["start_min"], record["end_min"]) == (480, 570)
+    assert record["id"] == event_id("2026-03-02|08:00|09:30|Anatomia|101|11|main|dr A")
+    assert record["color_hsl"] == subject_color_hsl("Anatomia")
+    assert table.records[1] is None
+    assert table.start_min.tolist() == [480, 600]
@@ -1,6 +1,65 @@
 from datetime import datetime, time as dtime
+from typing import Any
 
-from app.utils import is_magdalenka_group, parse_time_value, to_minutes
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils import is_magdalenka_group, normalize_time_series, parse_time_series, parse_time_value, to_minutes
+
+
+
+def _baseline_parse_time_value(value: Any) -> dtime | None:
+    """``parse_time_value`` before it read numeric day fractions and ``NaT``; frozen for comparison."""
+    if value is None:
+        return None
+
+    if isinstance(value, dtime):
+        return value.replace(microsecond=0)
+
+    if isinstance(value, datetime):
+        return value.time().replace(microsecond=0)
+
+    if pd.isna(value):
+        return None
+
+    raw = str(value).strip()
+    if not raw:
+        return None
+
+    for fmt in ("%H:%M:%S", "%H:%M"):
+        try:
+            return datetime.strptime(raw, fmt).time()
+        except ValueError:
+            continue
+
+    parsed = pd.to_datetime(value, errors="coerce")
+    if pd.isna(parsed):
+        return None
+
+    parsed_dt = parsed.to_pydatetime() if hasattr(parsed, "to_pydatetime") else None
+    return parsed_dt.time().replace(microsecond=0) if parsed_dt else None
+
+
+# Cell shapes whose parsing must not change: text, time and date-time values, and empty cells.
+BASELINE_TIME_CELLS = [
+    dtime(8, 15),
+    dtime(9, 45, 30, 250),
+    datetime(2026, 3, 2, 10, 5, 59),
+    pd.Timestamp("2026-03-02 11:20:30.7"),
+    "8:00",
+    "08:00",
+    "12:30:15",
+    "  7:5 ",
+    "8:00 AM",
+    "2026-03-02 13:40",
+    "25:00",
+    "12:60",
+    "abc",
+    "",
+    None,
+    np.nan,
+]
 
 
 def test_parse_time_value_accepts_multiple_formats() -> None:
@@ -13,6 +72,53 @@ def test_parse_time_value_from_datetime() -> None:
     assert parse_time_value(value) == dtime(9, 45)
 
 
+def test_parse_time_value_reads_excel_day_fractions() -> None:
+    assert parse_time_value(0.34375) == dtime(8, 15)
+    assert parse_time_value(46083.75) == dtime(18, 0)
+
+
+@pytest.mark.parametrize(
+    "series",
+    [
+        pd.Series(BASELINE_TIME_CELLS * 3, dtype=object),
+        pd.Series(pd.to_datetime(["2026-03-02 08:15:00", "2026-03-03 16:45:10", "2026-03-02 08:15:00"])),
+        pd.Series([], dtype=object),
+    ],
+)
+def test_parse_time_series_matches_baseline_parser(series: pd.Series) -> None:
+    expected = [_baseline_parse_time_value(value) for value in series.tolist()]
+
+    parsed = parse_time_series(series)
+
+    assert list(parsed.times) == expected
+    assert list(parsed.labels) == [value.strftime("%H:%M") if value else "" for value in expected]
+    assert parsed.minutes.tolist() == [to_minutes(value) if value else -1 for value in expected]
+    assert normalize_time_series(series).tolist() == expected
+
+
+def test_parse_time_series_reads_numeric_day_fractions() -> None:
+    series = pd.Series([0.5, np.nan, 0.34375, 46083.75, np.float64(0.25), 0.5])
+
+    parsed = parse_time_series(series)
+
+    assert list(parsed.times) == [dtime(12, 0), None, dtime(8, 15), dtime(18, 0), dtime(6, 0), dtime(12, 0)]
+    assert list(parsed.labels) == ["12:00", "", "08:15", "18:00", "06:00", "12:00"]
+    assert parsed.minutes.tolist() == [720, -1, 495, 1080, 360, 720]
+    assert parse_time_value(0.5) == dtime(12, 0)
+
+
+def test_parse_time_series_treats_nat_as_missing() -> None:
+    datetimes = pd.Series(pd.to_datetime(["2026-03-02 08:15:00", None]))
+    mixed = pd.Series([pd.NaT, "08:00", pd.NaT], dtype=object)
+
+    assert parse_time_value(pd.NaT) is None
+    assert list(parse_time_series(datetimes).times) == [dtime(8, 15), None]
+    assert parse_time_series(datetimes).minutes.tolist() == [495, -1]
+    assert list(parse_time_series(mixed).times) == [None, dtime(8, 0), None]
+    assert parse_time_series(mixed).labels.tolist() == ["", "08:00", ""]
+    assert normalize_time_series(mixed).tolist() == [None, dtime(8, 0), None]
+
+
 def test_to_minutes() -> None:
     assert to_minutes(dtime(10, 30)) == 630
 
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import threading
+import time
+
+import pytest
+
+from app import watcher as watcher_module
+from app.config import Settings
+from app.service import ScheduleService
+from app.watcher import FileWatcher, file_signature
+
+from conftest import MAIN_FILE, MAIN_ROWS, write_main_file
+
+
+def _watch(tracked: Path, *, use_notifications: bool) -> tuple[FileWatcher, threading.Event]:
+    changed = threading.Event()
+    watcher = FileWatcher(
+        tracked_files=lambda: [tracked],
+        on_change=changed.set,
+        poll_interval=0.05,
+        use_notifications=use_notifications,
+    )
+    return watcher, changed
+
+
+def test_file_signature_reports_missing_files(tmp_path: Path) -> None:
+    present = tmp_path / "plan.xlsx"
+    present.write_bytes(b"abc")
+
+    signature = file_signature([present, tmp_path / "brak.xlsx"])
+
+    assert signature.startswith("plan.xlsx:3:")
+    assert signature.endswith("|brak.xlsx:missing")
+
+
+def test_polling_watcher_reports_changes(tmp_path: Path) -> None:
+    tracked = tmp_path / "plan.xlsx"
+    tracked.write_bytes(b"first")
+    watcher, changed = _watch(tracked, use_notifications=False)
+    watcher.start()
+    try:
+        assert watcher.backend == "polling"
+        assert not changed.wait(0.2)
+
+        tracked.write_bytes(b"second version")
+        assert changed.wait(5)
+    finally:
+        watcher.stop()
+
+
+@pytest.mark.skipif(watcher_module.watchfiles is None, reason="watchfiles is not installed")
+def test_notification_watcher_ignores_untracked_files(tmp_path: Path) -> None:
+    tracked = tmp_path / "plan.xlsx"
+    tracked.write_bytes(b"first")
+    watcher, changed = _watch(tracked, use_notifications=True)
+    watcher.start()
+    try:
+        assert watcher.backend == "watchfiles"
+        (tmp_path / "inny.txt").write_text("x", encoding="utf-8")
+        assert not changed.wait(0.8)
+
+        tracked.write_bytes(b"second version")
+        assert changed.wait(5)
+    finally:
+        watcher.stop()
+
+
+def test_loading_a_snapshot_starts_no_threads(service: ScheduleService) -> None:
+    service.snapshot()
+
+    assert service._refresher is None
+    assert not any(thread.name in {"schedule-refresher", "schedule-watcher"} for thread in threading.enumerate())
+
+
+def test_requests_do_not_stat_source_files(
+    service: ScheduleService,
+    settings: Settings,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    service.snapshot()
+
+    def fail(*args: object, **kwargs: object) -> str:
+        raise AssertionError("request path touched the file system")
+
+    monkeypatch.setattr(service, "_build_fingerprint", fail)
+    monkeypatch.setattr(service, "_source_hash", fail)
+
+    for _ in range(3):
+        assert service.snapshot().version is not None
+
+
+def test_watcher_triggers_background_reload(service: ScheduleService, settings: Settings) -> None:
+    first = service.snapshot()
+    service.start()
+
+    write_main_file(settings.data_dir / MAIN_FILE, rows=MAIN_ROWS[:2])
+
+    deadline = time.monotonic() + 10
+    while service.snapshot().version == first.version and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert service.snapshot().version != first.version
+    assert service.health().records == 4
+
+
+@pytest.mark.parametrize("use_notifications", [False, True])
+def test_watcher_reports_changes_made_right_after_start(tmp_path: Path, use_notifications: bool) -> None:
+    if use_notifications and watcher_module.watchfiles is None:
+        pytest.skip("watchfiles is not installed")
+    tracked = tmp_path / "runtime_settings.json"
+    tracked.write_text("{}", encoding="utf-8")
+    watcher, changed = _watch(tracked, use_notifications=use_notifications)
+    watcher.start()
+    try:
+        tracked.write_text('{"magdalenka_prefixes": ["12"]}', encoding="utf-8")
+        assert changed.wait(5)
+    finally:
+        watcher.stop()
+
+
+def test_settings_edits_are_read_off_the_request_thread(
+    service: ScheduleService,
+    settings: Settings,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    service.snapshot()
+    service.start()
+    store = service._runtime_store
+    read_file = store._read_file
+    readers: list[str] = []
+
+    def tracking_read() -> object:
+        readers.append(threading.current_thread().name)
+        return read_file()
+
+    monkeypatch.setattr(store, "_read_file", tracking_read)
+    payload = json.loads(settings.runtime_settings_file.read_text(encoding="utf-8"))
+    payload["magdalenka_prefixes"] = ["12"]
+    settings.runtime_settings_file.write_text(json.dumps(payload), encoding="utf-8")
+
+    deadline = time.monotonic() + 10
+    while service.runtime_settings_data().magdalenka_prefixes != ("12",) and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert service.runtime_settings_data().magdalenka_prefixes == ("12",)
+    assert readers and threading.current_thread().name not in readers
@@ -1,4 +1,4 @@
-import { useEffect, useMemo, useState } from "react";
+import { useEffect, useMemo, useRef, useState } from "react";
 import { useQuery, useQueryClient } from "@tanstack/react-query";
 import { motion } from "framer-motion";
 import { Sparkles } from "lucide-react";
@@ -11,6 +11,7 @@ import {
   fetchMeta,
   fetchRuntimeSettings,
   fetchWeekSchedule,
+  subscribeToDatasetChanges,
   updateRuntimeSettings,
   uploadMainScheduleFile,
   uploadPracticalScheduleFile,
@@ -20,6 +21,8 @@ import { createDefaultFilters, readUrlState, writeUrlState } from "./lib/urlStat
 import type { UrlState } from "./types";
 
 const FALLBACK_TIMEZONE = "Europe/Warsaw";
+// Changes are pushed over SSE; polling only covers dropped connections.
+const FALLBACK_REFETCH_MS = 5 * 60_000;
 
 function parseListInput(value: string): string[] {
   return value
@@ -70,16 +73,30 @@ export default function App() {
     }
   }, [settingsPassword]);
 
+  const datasetVersionRef = useRef<string | null>(null);
+
+  useEffect(
+    () =>
+      subscribeToDatasetChanges((version) => {
+        const previous = datasetVersionRef.current;
+        datasetVersionRef.current = version;
+        if (previous !== null && previous !== version) {
+          void queryClient.invalidateQueries();
+        }
+      }),
+    [queryClient],
+  );
+
   const metaQuery = useQuery({
     queryKey: ["meta"],
     queryFn: fetchMeta,
-    refetchInterval: 60_000,
+    refetchInterval: FALLBACK_REFETCH_MS,
   });
 
   const runtimeSettingsQuery = useQuery({
     queryKey: ["runtime-settings"],
     queryFn: fetchRuntimeSettings,
-    refetchInterval: 60_000,
+    refetchInterval: FALLBACK_REFETCH_MS,
   });
 
   useEffect(() => {
@@ -94,7 +111,7 @@ export default function App() {
   const weekQuery = useQuery({
     queryKey: ["week", state.date, state.filters],
     queryFn: () => fetchWeekSchedule(state.date, state.filters),
-    refetchInterval: 60_000,
+    refetchInterval: FALLBACK_REFETCH_MS,
     enabled: Boolean(state.date),
   });
 
@@ -1,11 +1,13 @@
 import type {
   ActiveFilters,
   ApiError,
+  CompactWeekSchedule,
   DaySchedule,
   HealthResponse,
   MetaResponse,
   RuntimeSettings,
   RuntimeSettingsUpdatePayload,
+  ScheduleEvent,
   WeekSchedule,
 } from "../types";
 
@@ -80,10 +82,66 @@ export function fetchDaySchedule(date: string, filters: ActiveFilters): Promise<
   return requestJson<DaySchedule>(`/api/v1/schedule/day?date=${encodeURIComponent(date)}${buildFilterQuery(filters)}`);
 }
 
-export function fetchWeekSchedule(anchorDate: string, filters: ActiveFilters): Promise<WeekSchedule> {
-  return requestJson<WeekSchedule>(
-    `/api/v1/schedule/week?anchor_date=${encodeURIComponent(anchorDate)}${buildFilterQuery(filters)}`,
+const COMPACT_STRING_FIELDS = new Set([
+  "start_time",
+  "end_time",
+  "subject",
+  "instructor",
+  "room",
+  "group",
+  "oddzial",
+  "type",
+  "source",
+  "color_hsl",
+]);
+
+function expandCompactWeek(payload: CompactWeekSchedule): WeekSchedule {
+  return {
+    week_start: payload.week_start,
+    week_end: payload.week_end,
+    days: payload.days.map((day) => ({
+      ...day,
+      events: day.events.map((values) => {
+        const event: Record<string, string | number> = { date: day.date };
+        payload.fields.forEach((field, index) => {
+          const value = values[index];
+          event[field] = COMPACT_STRING_FIELDS.has(field) ? payload.strings[Number(value)] : value;
+        });
+        return event as unknown as ScheduleEvent;
+      }),
+    })),
+  };
+}
+
+export async function fetchWeekSchedule(anchorDate: string, filters: ActiveFilters): Promise<WeekSchedule> {
+  const payload = await requestJson<CompactWeekSchedule>(
+    `/api/v1/schedule/week?anchor_date=${encodeURIComponent(anchorDate)}&format=compact${buildFilterQuery(filters)}`,
   );
+  return expandCompactWeek(payload);
+}
+
+export function subscribeToDatasetChanges(onChange: (version: string) => void): () => void {
+  if (typeof EventSource === "undefined") {
+    return () => undefined;
+  }
+
+  const source = new EventSource(withBase("/api/v1/events/stream"));
+  const onDataset = (event: MessageEvent) => {
+    try {
+      const payload = JSON.parse(String(event.data)) as { version?: string };
+      if (payload.version) {
+        onChange(payload.version);
+      }
+    } catch {
+      // Ignore malformed frames; the fallback polling keeps data fresh.
+    }
+  };
+
+  source.addEventListener("dataset", onDataset);
+  return () => {
+    source.removeEventListener("dataset", onDataset);
+    source.close();
+  };
 }
 
 export function fetchRuntimeSettings(): Promise<RuntimeSettings> {
@@ -48,9 +48,22 @@ export interface WeekSchedule {
   days: DaySchedule[];
 }
 
+export interface CompactWeekSchedule {
+  format: "compact";
+  version: number;
+  week_start: string;
+  week_end: string;
+  fields: string[];
+  strings: string[];
+  days: Array<Omit<DaySchedule, "events"> & { events: Array<Array<string | number>> }>;
+}
+
 export interface HealthResponse {
   status: string;
   last_reload_at: string | null;
+  last_checked_at: string | null;
+  last_failed_at: string | null;
+  last_error: string | null;
   cache_ttl_seconds: number;
   records: number;
 }